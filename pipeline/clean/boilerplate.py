@@ -0,0 +1,70 @@
+# pipeline/clean/boilerplate.py
+
+import re
+import json
+import unicodedata
+from collections import Counter
+from pathlib import Path
+
+DEFAULT_BOILERPLATE_PATH = Path("output/boilerplate.json")
+
+# Una línea es boilerplate si aparece en al menos MIN_PAGES páginas
+# y en al menos MIN_PAGE_RATIO del total de páginas del corpus
+MIN_PAGES = 3
+MIN_PAGE_RATIO = 0.2
+
+# Líneas con SKU, precio o puntos nunca son boilerplate aunque se repitan
+RE_PRODUCT_DATA = re.compile(r"\(\s*\d{3,7}\s*\)|\$|\bpts\b", re.I)
+
+
+def normalize_line(line: str) -> str:
+    """Llave de comparación: minúsculas, sin acentos, espacios colapsados."""
+    line = unicodedata.normalize("NFKD", line.casefold()).encode("ascii", "ignore").decode()
+    return " ".join(line.split())
+
+
+class BoilerplateIndex:
+    """
+    Cuenta en cuántas páginas (de uno o varios PDFs) aparece cada línea
+    normalizada. Las que se repiten en buena parte del corpus (pies legales,
+    slogans, avisos COFEPRIS) forman el conjunto de boilerplate.
+    """
+
+    def __init__(self):
+        self.counts = Counter()
+        self.pages = 0
+
+    def add_page(self, text: str):
+        keys = {normalize_line(ln) for ln in text.splitlines()}
+        keys.discard("")
+        self.counts.update(k for k in keys if not RE_PRODUCT_DATA.search(k))
+        self.pages += 1
+
+    def merge(self, other: "BoilerplateIndex"):
+        """Suma los conteos de otro índice (p. ej. el de un PDF hecho en otro proceso)."""
+        self.counts.update(other.counts)
+        self.pages += other.pages
+
+    def build(self, min_pages: int = MIN_PAGES, min_ratio: float = MIN_PAGE_RATIO) -> frozenset:
+        threshold = max(min_pages, min_ratio * self.pages)
+        return frozenset(k for k, c in self.counts.items() if c >= threshold)
+
+
+def strip_boilerplate(text: str, boilerplate: frozenset) -> str:
+    """Quita las líneas de boilerplate con una búsqueda O(1) por línea."""
+    if not boilerplate:
+        return text
+    return "\n".join(ln for ln in text.splitlines() if normalize_line(ln) not in boilerplate)
+
+
+def save_boilerplate(boilerplate: frozenset, path: Path = DEFAULT_BOILERPLATE_PATH):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(sorted(boilerplate), indent=2, ensure_ascii=False), encoding="utf-8")
+
+
+def load_boilerplate(path: Path = DEFAULT_BOILERPLATE_PATH) -> frozenset:
+    path = Path(path)
+    if not path.exists():
+        return frozenset()
+    return frozenset(json.loads(path.read_text(encoding="utf-8")))
@@ -1,21 +1,33 @@
-from .normalizer import normalize_text
-from .cleaner import clean_text_block
+from .fast_cleaner import clean_text_fast
 from .page_segmenter import segment_text
+from .boilerplate import strip_boilerplate
+from .prepared_page import PreparedPage
 
-def clean_page_text(raw_page_text: str) -> list:
+def clean_page_text(raw_page_text: str, boilerplate: frozenset = frozenset()) -> list:
     """
     Aplica el pipeline completo:
+    0. Quitar líneas de boilerplate del catálogo (si se da el conjunto)
     1. Normalización
     2. Limpieza avanzada
     3. Segmentación en bloques
+    Los pasos 1 y 2 corren en el motor compilado (fast_cleaner),
+    con el mismo resultado que normalize_text + clean_text_block.
     """
-    # Normalizar
-    normalized = normalize_text(raw_page_text)
+    # Quitar pies legales / slogans repetidos en todo el catálogo
+    text = strip_boilerplate(raw_page_text, boilerplate)
 
-    # Limpiar artefactos
-    cleaned = clean_text_block(normalized)
+    # Normalizar + limpiar artefactos
+    cleaned = clean_text_fast(text)
 
     # Segmentar
     blocks = segment_text(cleaned)
 
     return blocks
+
+def prepare_page_text(raw_page_text: str, boilerplate: frozenset = frozenset()) -> PreparedPage:
+    """
+    Paso de limpieza para clasificar + parsear: quita boilerplate y deja
+    la página lista (líneas, offsets y coincidencias) para classify_page
+    y los parsers, que comparten el mismo objeto.
+    """
+    return PreparedPage(strip_boilerplate(raw_page_text, boilerplate))
@@ -1,5 +1,118 @@
 import re
 
+# Separador de bloques: dobles saltos
+RE_BLOCK_SEP = re.compile(r"\n{2,}")
+
+# Contenido sin espacios en los extremos (equivale a .strip()); el greedy
+# solo retrocede sobre el espacio final
+RE_CONTENT = re.compile(r"\S(?:[\s\S]*\S)?")
+
+# Misma idea pero sin cruzar saltos de línea: una línea ya "strip"-eada.
+# Los cortes son los mismos que usa str.splitlines()
+_LINE_BREAKS = "\n\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029"
+RE_LINE_CONTENT = re.compile(rf"\S(?:[^{_LINE_BREAKS}]*\S)?")
+
+
+def segment_spans(text: str, start: int = 0, end: int | None = None) -> list:
+    """
+    Igual que segment_text, pero sin copiar: retorna [(start, end), ...]
+    con los offsets de cada bloque (ya sin espacios en los extremos)
+    dentro de `text`.
+    """
+    end = len(text) if end is None else end
+    spans = []
+    pos = start
+
+    for sep in RE_BLOCK_SEP.finditer(text, start, end):
+        m = RE_CONTENT.search(text, pos, sep.start())
+        if m:
+            spans.append(m.span())
+        pos = sep.end()
+
+    m = RE_CONTENT.search(text, pos, end)
+    if m:
+        spans.append(m.span())
+
+    return spans
+
+
+def line_spans(text: str, start: int = 0, end: int | None = None) -> list:
+    """
+    Offsets de las líneas no vacías, ya sin espacios en los extremos.
+    Equivale a [ln.strip() for ln in text.splitlines() if ln.strip()]
+    sin crear ninguna cadena.
+    """
+    end = len(text) if end is None else end
+    return [m.span() for m in RE_LINE_CONTENT.finditer(text, start, end)]
+
+
+class TextView:
+    """
+    Vista de solo lectura sobre un fragmento [start, end) del texto de la
+    página. Todas las vistas de una página comparten el mismo buffer; la
+    subcadena solo se crea al pedirla (str(view)).
+    """
+
+    __slots__ = ("buf", "start", "end")
+
+    def __init__(self, buf: str, start: int = 0, end: int | None = None):
+        self.buf = buf
+        self.start = start
+        self.end = len(buf) if end is None else end
+
+    def __str__(self) -> str:
+        return self.buf[self.start:self.end]
+
+    def __repr__(self) -> str:
+        return f"TextView({self.start}, {self.end}, {str(self)[:40]!r})"
+
+    def __len__(self) -> int:
+        return self.end - self.start
+
+    def __bool__(self) -> bool:
+        return self.end > self.start
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, TextView):
+            return str(self) == str(other)
+        if isinstance(other, str):
+            return len(other) == len(self) and self.buf.startswith(other, self.start)
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(str(self))
+
+    @property
+    def span(self) -> tuple:
+        return (self.start, self.end)
+
+    def find(self, sub: str) -> int:
+        """Posición de sub relativa a la vista, o -1 (sin copiar)."""
+        i = self.buf.find(sub, self.start, self.end)
+        return i - self.start if i >= 0 else -1
+
+    def __contains__(self, sub: str) -> bool:
+        return self.buf.find(sub, self.start, self.end) >= 0
+
+    def search(self, pattern: re.Pattern):
+        """pattern.search limitado a la vista; los offsets del match son absolutos."""
+        return pattern.search(self.buf, self.start, self.end)
+
+    def finditer(self, pattern: re.Pattern):
+        return pattern.finditer(self.buf, self.start, self.end)
+
+    def blocks(self) -> list:
+        return [TextView(self.buf, s, e) for s, e in segment_spans(self.buf, self.start, self.end)]
+
+    def lines(self) -> list:
+        return [TextView(self.buf, s, e) for s, e in line_spans(self.buf, self.start, self.end)]
+
+
+def segment_views(text: str) -> list:
+    """Bloques de la página como TextView sobre el mismo buffer."""
+    return TextView(text).blocks()
+
+
 def segment_text(text: str) -> list:
     """
     Divide la página en bloques lógicos basados en:
@@ -7,9 +120,10 @@ def segment_text(text: str) -> list:
     - patrones de precio
     - encabezados
     Retorna una lista de bloques limpios.
+    Ver segment_spans / segment_views para la versión sin copias.
     """
     # Separar por dobles saltos
-    blocks = re.split(r"\n{2,}", text)
+    blocks = RE_BLOCK_SEP.split(text)
 
     # Limpieza adicional por bloque
     blocks = [b.strip() for b in blocks if b.strip()]
@@ -0,0 +1,91 @@
+# pipeline/clean/prepared_page.py
+
+from bisect import bisect_right
+
+from ..text.lexer import tokenize, tokens_by_line
+
+# Subirla si cambia cómo se preparan las líneas (strip, clean_line): es
+# parte de la llave del cache de parseo (pipeline/parse/parse_cache.py)
+PREPARE_VERSION = 1
+
+
+class PreparedPage:
+    """
+    Trabajo común de una página, hecho una sola vez y compartido por el
+    clasificador y todos los parsers:
+    - stripped: líneas no vacías sin espacios en los extremos (clasificador)
+    - lines: las mismas pasadas por ParserBase.clean_line (parsers)
+    - text: "\\n".join(lines), con line_starts = offset de cada línea
+    - tokens: SKU / PRICE / POINTS / PERCENT / DE / A de todo `text` en una
+      sola pasada del lexer (pipeline/text/lexer.py), con su línea y offsets
+    - line_tokens: los mismos tokens agrupados por línea
+    tokens y line_tokens se calculan al primer uso.
+    """
+
+    __slots__ = ("raw", "stripped", "lines", "text", "line_starts", "_tokens", "_line_tokens")
+
+    def __init__(self, raw: str):
+        self.raw = raw
+        self.stripped = [ln for ln in map(str.strip, raw.splitlines()) if ln]
+        # clean_line: strip + colapsar dobles espacios (replace no copia si no hay)
+        self.lines = [ln.replace("  ", " ") for ln in self.stripped]
+        self.text = "\n".join(self.lines)
+
+        starts, pos = [], 0
+        for ln in self.lines:
+            starts.append(pos)
+            pos += len(ln) + 1
+        self.line_starts = starts
+
+        self._tokens = None
+        self._line_tokens = None
+
+    def __len__(self) -> int:
+        return len(self.lines)
+
+    def line_of(self, pos: int) -> int:
+        """Índice de la línea que contiene el offset `pos` de `text`."""
+        return bisect_right(self.line_starts, pos) - 1
+
+    @property
+    def tokens(self) -> list:
+        if self._tokens is None:
+            self._tokens = tokenize(self.text)
+        return self._tokens
+
+    @property
+    def line_tokens(self) -> list:
+        if self._line_tokens is None:
+            self._line_tokens = tokens_by_line(self.tokens, len(self.lines))
+        return self._line_tokens
+
+    def first(self, kinds, line: int | None = None):
+        """
+        Primer token de ese tipo (o de cualquiera de una tupla de tipos)
+        en la página o en una línea; None si no hay.
+        """
+        if isinstance(kinds, str):
+            kinds = (kinds,)
+        toks = self.tokens if line is None else self.line_tokens[line]
+        for tok in toks:
+            if tok.kind in kinds:
+                return tok
+        return None
+
+    def first_per_line(self, kind: str) -> dict:
+        """{índice de línea: primer token de ese tipo en la línea}"""
+        found = {}
+        for tok in self.tokens:
+            if tok.kind == kind and tok.line not in found:
+                found[tok.line] = tok
+        return found
+
+    def of_kind(self, kind: str) -> list:
+        return [tok for tok in self.tokens if tok.kind == kind]
+
+
+def prepare_page(page) -> PreparedPage:
+    """Acepta texto crudo o una PreparedPage ya construida (no la rehace)."""
+    if isinstance(page, PreparedPage):
+        return page
+    return PreparedPage(page)
@@ -1,5 +1,7 @@
 import fitz  # PyMuPDF
 
+from .metrics import track_page
+
 def detect_pdf_type(pdf_path: str) -> str:
     """
     Detecta si un PDF es de TEXTO o IMAGEN usando PyMuPDF.
@@ -8,8 +10,10 @@ def detect_pdf_type(pdf_path: str) -> str:
     doc = fitz.open(pdf_path)
     total_chars = 0
 
-    for page in doc:
-        text = page.get_text("text")
+    for i, page in enumerate(doc):
+        with track_page("detect", pdf_path, i+1, method="native") as rec:
+            text = page.get_text("text")
+            rec["chars"] = len(text)
         total_chars += len(text.strip())
 
     doc.close()
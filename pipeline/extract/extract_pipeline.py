@@ -1,10 +1,48 @@
 from .detect_pdf_type import detect_pdf_type
 from .text_extractor import extract_text_from_pdf
 from .ocr_extractor import extract_text_ocr
+from .page_engine import extract_pdf_single_pass, iter_pdf_pages_single_pass
+from .page_cache import PageCache
 
-def extract_pdf(pdf_path: str) -> dict:
+def extract_pdf(pdf_path: str, use_cache: bool = True, hybrid: bool = False) -> dict:
     """
-    Detecta el tipo de PDF y extrae su contenido.
+    Extrae el contenido del PDF en una sola pasada, decidiendo
+    texto u OCR por página (ver page_engine).
+    Con use_cache, reutiliza el texto guardado en output/cache/.
+    Con hybrid, las páginas mixtas hacen OCR solo de sus imágenes.
+    Retorna: {page_number: text}
+    """
+    if not use_cache:
+        return extract_pdf_single_pass(pdf_path, hybrid=hybrid)
+
+    cache = PageCache()
+    try:
+        return extract_pdf_single_pass(pdf_path, cache=cache, hybrid=hybrid)
+    finally:
+        cache.close()
+
+
+def iter_pdf_pages(pdf_path: str, use_cache: bool = True, hybrid: bool = False):
+    """
+    Variante en streaming de extract_pdf: produce cada página apenas
+    termina de extraerse, para poder clasificar/parsear sin esperar al final.
+    Genera: (page_number, text, meta)
+    """
+    if not use_cache:
+        yield from iter_pdf_pages_single_pass(pdf_path, hybrid=hybrid)
+        return
+
+    cache = PageCache()
+    try:
+        yield from iter_pdf_pages_single_pass(pdf_path, cache=cache, hybrid=hybrid)
+    finally:
+        cache.close()
+
+
+def extract_pdf_by_document(pdf_path: str) -> dict:
+    """
+    Modo anterior: detecta el tipo de todo el documento y luego
+    lo vuelve a abrir para extraerlo completo (texto u OCR).
     Retorna: {page_number: text}
     """
     pdf_type = detect_pdf_type(pdf_path)
@@ -0,0 +1,62 @@
+# pipeline/extract/hybrid_extractor.py
+
+import pytesseract
+
+from .ocr_extractor import preprocess_image, pixmap_to_bgr
+from .tesseract_pool import TesseractPool
+
+# Ignorar íconos, logos y viñetas: regiones con algún lado menor a esto (puntos PDF)
+MIN_IMAGE_SIDE_PT = 40
+
+
+def image_regions(page) -> list:
+    """
+    Rectángulos (en puntos PDF) donde la página dibuja imágenes,
+    recortados al área visible y sin íconos pequeños.
+    """
+    import fitz  # PyMuPDF
+
+    regions = []
+    for info in page.get_image_info():
+        rect = fitz.Rect(info["bbox"]) & page.rect
+        if rect.is_empty:
+            continue
+        if rect.width < MIN_IMAGE_SIDE_PT or rect.height < MIN_IMAGE_SIDE_PT:
+            continue
+        regions.append(rect)
+    return regions
+
+
+def ocr_region(page, rect, dpi: int = 300, lang: str = "spa",
+               pool: TesseractPool | None = None) -> str:
+    """Rasteriza solo el clip de la región y le aplica OCR."""
+    pix = page.get_pixmap(dpi=dpi, clip=rect, alpha=False)
+    processed = preprocess_image(pixmap_to_bgr(pix))
+    if pool is not None:
+        return pool.ocr_image(processed)
+    return pytesseract.image_to_string(processed, lang=lang)
+
+
+def extract_page_hybrid(page, dpi: int = 300, lang: str = "spa",
+                        pool: TesseractPool | None = None) -> str:
+    """
+    Página mixta: texto nativo + OCR solo de los bloques de imagen
+    (banners con precio o SKU). El costo de OCR es proporcional al área
+    de imagen, no al número de páginas.
+    Los bloques se combinan en orden de lectura (arriba→abajo, izq→der),
+    el mismo criterio que get_text(sort=True).
+    """
+    items = []
+
+    # (x0, y0, x1, y1, text, block_no, block_type) — type 0 = texto
+    for x0, y0, _x1, _y1, text, _no, btype in page.get_text("blocks"):
+        if btype == 0 and text.strip():
+            items.append((round(y0), x0, text.strip()))
+
+    for rect in image_regions(page):
+        text = ocr_region(page, rect, dpi=dpi, lang=lang, pool=pool).strip()
+        if text:
+            items.append((round(rect.y0), rect.x0, text))
+
+    items.sort(key=lambda it: (it[0], it[1]))
+    return "\n".join(text for _y, _x, text in items) + "\n" if items else ""
@@ -0,0 +1,106 @@
+# pipeline/extract/layout_extractor.py
+
+import fitz  # PyMuPDF
+import numpy as np
+
+
+class PageLayout:
+    """
+    Spans de texto de una página en arreglos compactos de NumPy:
+    - texts: lista de strings (uno por span)
+    - bbox:  float32 (n, 4) → x0, y0, x1, y1
+    - size:  float32 (n,)   → tamaño de fuente
+    - line:  int32 (n,)     → id de línea dentro de la página (ascendente)
+    """
+
+    __slots__ = ("page", "texts", "bbox", "size", "line", "width", "height")
+
+    def __init__(self, page, texts, bbox, size, line, width, height):
+        self.page = page
+        self.texts = texts
+        self.bbox = bbox
+        self.size = size
+        self.line = line
+        self.width = width
+        self.height = height
+
+    def __len__(self):
+        return len(self.texts)
+
+    def lines(self) -> tuple[list, np.ndarray, np.ndarray]:
+        """
+        Agrupa los spans por línea (sin ciclos por span para las cajas).
+        Retorna: (textos, bbox unión float32 (m, 4), tamaño máximo float32 (m,))
+        """
+        if not self.texts:
+            return [], np.empty((0, 4), np.float32), np.empty(0, np.float32)
+
+        starts = np.flatnonzero(np.r_[True, self.line[1:] != self.line[:-1]])
+        boxes = np.stack([
+            np.minimum.reduceat(self.bbox[:, 0], starts),
+            np.minimum.reduceat(self.bbox[:, 1], starts),
+            np.maximum.reduceat(self.bbox[:, 2], starts),
+            np.maximum.reduceat(self.bbox[:, 3], starts),
+        ], axis=1)
+        sizes = np.maximum.reduceat(self.size, starts)
+
+        ends = list(starts[1:]) + [len(self.texts)]
+        texts = [
+            " ".join(t.strip() for t in self.texts[s:e] if t.strip())
+            for s, e in zip(starts, ends)
+        ]
+        return texts, boxes, sizes
+
+
+def extract_page_layout(page, page_number: int) -> PageLayout:
+    """Construye el PageLayout de una página con get_text("dict")."""
+    data = page.get_text("dict", flags=fitz.TEXTFLAGS_TEXT)
+
+    texts, boxes, sizes, line_ids = [], [], [], []
+    line_id = 0
+
+    for block in data["blocks"]:
+        if block.get("type", 0) != 0:  # 1 = imagen
+            continue
+        for ln in block["lines"]:
+            added = False
+            for span in ln["spans"]:
+                if not span["text"].strip():
+                    continue
+                texts.append(span["text"])
+                boxes.append(span["bbox"])
+                sizes.append(span["size"])
+                line_ids.append(line_id)
+                added = True
+            if added:
+                line_id += 1
+
+    return PageLayout(
+        page=page_number,
+        texts=texts,
+        bbox=np.asarray(boxes, dtype=np.float32).reshape(-1, 4),
+        size=np.asarray(sizes, dtype=np.float32),
+        line=np.asarray(line_ids, dtype=np.int32),
+        width=page.rect.width,
+        height=page.rect.height,
+    )
+
+
+def iter_pdf_layouts(pdf_path: str):
+    """
+    Genera: (page_number, PageLayout) página por página.
+    """
+    doc = fitz.open(pdf_path)
+    try:
+        for i, page in enumerate(doc):
+            yield i+1, extract_page_layout(page, i+1)
+    finally:
+        doc.close()
+
+
+def extract_layout_from_pdf(pdf_path: str) -> dict:
+    """
+    Modo layout: spans con caja y tamaño de fuente por página.
+    Retorna: {page_number: PageLayout}
+    """
+    return dict(iter_pdf_layouts(pdf_path))
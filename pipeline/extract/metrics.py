@@ -0,0 +1,169 @@
+# pipeline/extract/metrics.py
+
+import json
+import sys
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+try:
+    import resource  # no existe en Windows
+except ImportError:
+    resource = None
+
+METRICS_DIR = Path("output/metrics")
+PROM_PREFIX = "catalog_extract"
+
+
+def peak_rss_mb() -> float | None:
+    """Pico de memoria residente del proceso (MB), o None si no se puede medir."""
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux reporta KB, macOS bytes
+        return round(peak / (2**20 if sys.platform == "darwin" else 2**10), 1)
+    try:
+        import psutil
+        return round(psutil.Process().memory_info().peak_wset / 2**20, 1)
+    except Exception:
+        return None
+
+
+class ExtractionMetrics:
+    """
+    Acumula un registro por página y etapa:
+    {"stage", "pdf", "page", "method", "dpi", "chars", "seconds", "peak_rss_mb"}
+    """
+
+    def __init__(self):
+        self.records = []
+
+    def add(self, record: dict):
+        self.records.append(record)
+
+    def extend(self, records: list):
+        self.records.extend(records)
+
+    def drain(self) -> list:
+        """Entrega y vacía los registros (p. ej. para mandarlos desde un worker)."""
+        records, self.records = self.records, []
+        return records
+
+    def summary(self) -> dict:
+        """Totales por (stage, method, pdf)."""
+        agg = defaultdict(lambda: {"pages": 0, "seconds": 0.0, "chars": 0})
+        for r in self.records:
+            row = agg[(r["stage"], r["method"] or "unknown", r["pdf"])]
+            row["pages"] += 1
+            row["seconds"] = round(row["seconds"] + r["seconds"], 6)
+            row["chars"] += r["chars"]
+        return dict(agg)
+
+    def export(self, out_dir: Path = METRICS_DIR, name: str = "extract") -> tuple[Path, Path]:
+        """
+        Escribe:
+        - <name>_metrics.jsonl: un registro por línea, se agrega a lo anterior
+          (para comparar corridas / ciclos).
+        - <name>_metrics.prom: formato textfile de Prometheus con los totales
+          de esta corrida (se sobrescribe).
+        Los registros escritos se vacían: otro export en el mismo proceso
+        solo agrega los registros nuevos.
+        """
+        out_dir = Path(out_dir)
+        out_dir.mkdir(parents=True, exist_ok=True)
+        run_id = datetime.now().isoformat(timespec="seconds")
+
+        prom = self.to_prometheus()
+        records = self.drain()
+
+        jsonl_path = out_dir / f"{name}_metrics.jsonl"
+        with open(jsonl_path, "a", encoding="utf-8") as f:
+            for r in records:
+                f.write(json.dumps({"run": run_id, **r}, ensure_ascii=False) + "\n")
+
+        prom_path = out_dir / f"{name}_metrics.prom"
+        prom_path.write_text(prom, encoding="utf-8")
+
+        return jsonl_path, prom_path
+
+    def to_prometheus(self) -> str:
+        lines = []
+        series = [
+            ("pages_total", "counter", "Páginas procesadas", "pages"),
+            ("seconds_total", "counter", "Tiempo de pared acumulado (s)", "seconds"),
+            ("chars_total", "counter", "Caracteres producidos", "chars"),
+        ]
+        summary = self.summary()
+
+        for metric, mtype, help_text, field in series:
+            lines.append(f"# HELP {PROM_PREFIX}_{metric} {help_text}")
+            lines.append(f"# TYPE {PROM_PREFIX}_{metric} {mtype}")
+            for (stage, method, pdf), row in sorted(summary.items()):
+                labels = f'stage="{stage}",method="{method}",pdf="{_escape(pdf)}"'
+                lines.append(f"{PROM_PREFIX}_{metric}{{{labels}}} {row[field]}")
+
+        # Página más lenta de la corrida (para ubicar cuellos de botella)
+        if self.records:
+            slowest = max(self.records, key=lambda r: r["seconds"])
+            lines.append(f"# HELP {PROM_PREFIX}_slowest_page_seconds Página más lenta")
+            lines.append(f"# TYPE {PROM_PREFIX}_slowest_page_seconds gauge")
+            labels = (f'stage="{slowest["stage"]}",pdf="{_escape(slowest["pdf"])}",'
+                      f'page="{slowest["page"]}"')
+            lines.append(f"{PROM_PREFIX}_slowest_page_seconds{{{labels}}} {slowest['seconds']}")
+
+        peaks = [r["peak_rss_mb"] for r in self.records if r["peak_rss_mb"] is not None]
+        if peaks:
+            lines.append(f"# HELP {PROM_PREFIX}_peak_rss_megabytes Pico de memoria residente")
+            lines.append(f"# TYPE {PROM_PREFIX}_peak_rss_megabytes gauge")
+            lines.append(f"{PROM_PREFIX}_peak_rss_megabytes {max(peaks)}")
+
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"')
+
+
+# Colector del proceso: todas las etapas de extracción escriben aquí
+METRICS = ExtractionMetrics()
+
+
+def get_metrics() -> ExtractionMetrics:
+    return METRICS
+
+
+def reset_worker_metrics():
+    """
+    initializer de los pools de procesos: con fork el worker hereda los
+    registros del padre; se descartan para que drain() en el worker solo
+    entregue lo que el worker midió.
+    """
+    METRICS.drain()
+
+
+@contextmanager
+def track_page(stage: str, pdf_path, page: int | None,
+               method: str | None = None, dpi: int | None = None):
+    """
+    Mide una página: el bloque puede completar rec["chars"], rec["method"], etc.
+
+        with track_page("text", pdf_path, 3, method="native") as rec:
+            text = page.get_text("text")
+            rec["chars"] = len(text)
+    """
+    rec = {
+        "stage": stage,
+        "pdf": Path(pdf_path).name,
+        "page": page,
+        "method": method,
+        "dpi": dpi,
+        "chars": 0,
+    }
+    t0 = time.perf_counter()
+    try:
+        yield rec
+    finally:
+        rec["seconds"] = round(time.perf_counter() - t0, 6)
+        rec["peak_rss_mb"] = peak_rss_mb()
+        METRICS.add(rec)
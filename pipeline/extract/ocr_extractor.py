@@ -1,8 +1,18 @@
+import os
 import pytesseract
-from pdf2image import convert_from_path
 import cv2
 import numpy as np
 from pathlib import Path
+from concurrent.futures import wait, FIRST_COMPLETED
+
+from .page_ranges import extract_ranges_parallel
+from .tesseract_pool import TesseractPool
+from .metrics import get_metrics, track_page
+
+# OCR adaptativo: primera pasada barata y re-OCR solo donde la confianza es baja
+ADAPTIVE_LOW_DPI = 150
+ADAPTIVE_MIN_CONF = 60
+ADAPTIVE_PAD_PT = 2  # margen (puntos PDF) alrededor de cada región re-OCR
 
 def preprocess_image(img):
     """Mejora OCR: escala gris, threshold, dilatación suave."""
@@ -11,14 +21,217 @@ def preprocess_image(img):
     thresh = cv2.threshold(blur, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)[1]
     return thresh
 
-def extract_text_ocr(pdf_path: str) -> dict:
-    pages_text = {}
-    images = convert_from_path(pdf_path, dpi=300)
+def pixmap_to_bgr(pix):
+    """Convierte un fitz.Pixmap RGB en imagen BGR de OpenCV, sin pasar por PNG."""
+    img = np.frombuffer(pix.samples, dtype=np.uint8).reshape(pix.height, pix.width, pix.n)
+    return cv2.cvtColor(img, cv2.COLOR_RGB2BGR)
+
+def ocr_page(page, dpi: int = 300, lang: str = "spa",
+             pool: TesseractPool | None = None) -> str:
+    """
+    OCR de una sola página de PyMuPDF ya abierta.
+    Con pool, usa los workers de tesseract de larga vida en vez de un proceso
+    nuevo; el idioma es el del pool (lang distinto es un error).
+    """
+    if pool is not None and lang != pool.lang:
+        raise ValueError(f"ocr_page: lang={lang!r} pero el pool está inicializado con {pool.lang!r}")
+    pix = page.get_pixmap(dpi=dpi, alpha=False)
+    processed = preprocess_image(pixmap_to_bgr(pix))
+    if pool is not None:
+        return pool.ocr_image(processed)
+    return pytesseract.image_to_string(processed, lang=lang)
+
+def ocr_page_adaptive(
+    page,
+    low_dpi: int = ADAPTIVE_LOW_DPI,
+    high_dpi: int = 300,
+    min_conf: float = ADAPTIVE_MIN_CONF,
+    lang: str = "spa",
+) -> str:
+    """
+    OCR adaptativo de una página:
+    1. OCR completo a baja resolución con confianza por palabra (image_to_data).
+    2. Las líneas con alguna palabra bajo min_conf se re-rasterizan solo en su
+       región (clip) a high_dpi y se vuelven a leer.
+    Las páginas de catálogo son casi todo foto: la mayoría de los píxeles a
+    300 dpi no tienen texto.
+    """
+    import fitz  # PyMuPDF
+
+    pix = page.get_pixmap(dpi=low_dpi, alpha=False)
+    data = pytesseract.image_to_data(
+        preprocess_image(pixmap_to_bgr(pix)),
+        lang=lang,
+        output_type=pytesseract.Output.DICT,
+    )
+    del pix
+
+    # Agrupar palabras por línea, en el orden de lectura de tesseract
+    lines = {}
+    for i, word in enumerate(data["text"]):
+        if not word.strip():
+            continue
+        key = (data["block_num"][i], data["par_num"][i], data["line_num"][i])
+        x, y = data["left"][i], data["top"][i]
+        x1, y1 = x + data["width"][i], y + data["height"][i]
+
+        entry = lines.get(key)
+        if entry is None:
+            entry = lines[key] = {"words": [], "low": False, "box": [x, y, x1, y1]}
+        else:
+            box = entry["box"]
+            box[0], box[1] = min(box[0], x), min(box[1], y)
+            box[2], box[3] = max(box[2], x1), max(box[3], y1)
+
+        entry["words"].append(word)
+        entry["low"] |= float(data["conf"][i]) < min_conf
+
+    scale = 72 / low_dpi  # píxeles a baja resolución → puntos PDF
+    out = []
+    prev_block = None
+
+    for (block, _par, _line), entry in lines.items():
+        text = " ".join(entry["words"])
+
+        if entry["low"]:
+            x0, y0, x1, y1 = entry["box"]
+            clip = fitz.Rect(
+                x0 * scale - ADAPTIVE_PAD_PT, y0 * scale - ADAPTIVE_PAD_PT,
+                x1 * scale + ADAPTIVE_PAD_PT, y1 * scale + ADAPTIVE_PAD_PT,
+            ) & page.rect
+            if not clip.is_empty:
+                hi = page.get_pixmap(dpi=high_dpi, clip=clip, alpha=False)
+                # --psm 7: la región es una sola línea de texto
+                re_text = pytesseract.image_to_string(
+                    preprocess_image(pixmap_to_bgr(hi)), lang=lang, config="--psm 7"
+                ).strip()
+                text = re_text or text
+
+        if prev_block is not None and block != prev_block:
+            out.append("")
+        out.append(text)
+        prev_block = block
+
+    return "\n".join(out) + "\n" if out else ""
+
+def _ocr_range(pdf_path: str, start: int, end: int, dpi: int = 300,
+               lang: str = "spa", adaptive: bool = False) -> tuple:
+    """
+    Worker: abre su propio documento y hace OCR de las páginas [start, end).
+    Retorna: ([(page_number, text), ...], métricas por página)
+    """
+    import fitz  # PyMuPDF
+
+    method = "ocr-adaptive" if adaptive else "ocr"
+    doc = fitz.open(pdf_path)
+    pages = []
+    try:
+        for i in range(start, end):
+            with track_page("ocr", pdf_path, i+1, method=method, dpi=dpi) as rec:
+                if adaptive:
+                    text = ocr_page_adaptive(doc[i], high_dpi=dpi, lang=lang)
+                else:
+                    text = ocr_page(doc[i], dpi=dpi, lang=lang)
+                rec["chars"] = len(text)
+            pages.append((i+1, text))
+    finally:
+        doc.close()
+    return pages, get_metrics().drain()
+
+def extract_text_ocr(pdf_path: str, workers: int = 1,
+                     chunk_size: int | None = None, adaptive: bool = False) -> dict:
+    """
+    OCR de todo el documento a 300 dpi.
+    Con workers > 1 reparte rangos de páginas entre procesos. Con cualquier
+    número de workers las páginas se rasterizan con PyMuPDF y se leen con
+    ocr_page / ocr_page_adaptive: el texto no depende de workers.
+    Con adaptive, cada página se lee a baja resolución y solo las regiones
+    de baja confianza se re-leen a 300 dpi (ver ocr_page_adaptive).
+    Retorna: {page_number: text}
+    """
+    method = "ocr-adaptive" if adaptive else "ocr"
 
-    for i, img in enumerate(images):
-        img_np = cv2.cvtColor(np.array(img), cv2.COLOR_RGB2BGR)
-        processed = preprocess_image(img_np)
-        text = pytesseract.image_to_string(processed, lang="spa")
-        pages_text[i+1] = text
+    if workers > 1:
+        # Cada worker mide sus páginas y las métricas regresan con el rango
+        return extract_ranges_parallel(pdf_path, _ocr_range, workers, chunk_size,
+                                       dpi=300, adaptive=adaptive)
+
+    # Un solo proceso: lo mismo que _ocr_range, con métricas por página
+    import fitz  # PyMuPDF
+
+    pages_text = {}
+    doc = fitz.open(pdf_path)
+    try:
+        for i, page in enumerate(doc):
+            with track_page("ocr", pdf_path, i+1, method=method, dpi=300) as rec:
+                if adaptive:
+                    text = ocr_page_adaptive(page, high_dpi=300)
+                else:
+                    text = ocr_page(page, dpi=300)
+                rec["chars"] = len(text)
+            pages_text[i+1] = text
+    finally:
+        doc.close()
 
     return pages_text
+
+
+def extract_text_ocr_streaming(
+    pdf_path: str,
+    dpi: int = 300,
+    workers: int | None = None,
+    max_in_flight: int | None = None,
+    lang: str = "spa",
+    batch_size: int = 4,
+) -> dict:
+    """
+    OCR en paralelo con memoria acotada:
+    - Rasteriza las páginas una a una con PyMuPDF (no todo el PDF de golpe).
+    - Reparte el OCR en un TesseractPool de larga vida (workers, default: núcleos),
+      en lotes de batch_size páginas pasadas como píxeles en memoria.
+    - Nunca hay más de max_in_flight páginas rasterizadas en memoria
+      (default: 2 × workers × batch_size).
+    Retorna: {page_number: text}
+    """
+    import fitz  # PyMuPDF
+
+    workers = workers or os.cpu_count() or 1
+    batch_size = max(1, batch_size)
+    max_in_flight = max(batch_size, max_in_flight or 2 * workers * batch_size)
+
+    pages_text = {}
+    doc = fitz.open(pdf_path)
+
+    def _collect(done):
+        for fut in done:
+            page_numbers = pending.pop(fut)
+            pages_text.update(zip(page_numbers, fut.result()))
+
+    try:
+        with TesseractPool(workers=workers, lang=lang) as pool:
+            pending = {}  # future -> [page_number, ...]
+            batch, batch_pages = [], []
+
+            for i, page in enumerate(doc):
+                # Esperar a que se libere un lugar antes de rasterizar otra página
+                while (len(pending) + 1) * batch_size > max_in_flight:
+                    done, _ = wait(list(pending), return_when=FIRST_COMPLETED)
+                    _collect(done)
+
+                pix = page.get_pixmap(dpi=dpi, alpha=False)
+                batch.append(preprocess_image(pixmap_to_bgr(pix)))
+                batch_pages.append(i+1)
+                del pix
+
+                if len(batch) == batch_size:
+                    pending[pool.submit(batch)] = batch_pages
+                    batch, batch_pages = [], []
+
+            if batch:
+                pending[pool.submit(batch)] = batch_pages
+
+            _collect(wait(list(pending)).done)
+    finally:
+        doc.close()
+
+    return dict(sorted(pages_text.items()))
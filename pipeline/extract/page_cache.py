@@ -0,0 +1,240 @@
+# pipeline/extract/page_cache.py
+
+import hashlib
+import sqlite3
+import time
+from pathlib import Path
+
+DEFAULT_CACHE_PATH = Path("output/cache/page_text.sqlite")
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024  # 512 MB de texto
+
+# Cada cuántas páginas nuevas se escribe al cache mientras se itera
+FLUSH_EVERY = 16
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    pdf_hash  TEXT    NOT NULL,
+    method    TEXT    NOT NULL,
+    version   INTEGER NOT NULL,
+    page      INTEGER NOT NULL,
+    text      TEXT    NOT NULL,
+    used      TEXT    NOT NULL,
+    size      INTEGER NOT NULL,
+    last_used REAL    NOT NULL,
+    PRIMARY KEY (pdf_hash, method, version, page)
+);
+CREATE TABLE IF NOT EXISTS documents (
+    pdf_hash   TEXT    NOT NULL,
+    method     TEXT    NOT NULL,
+    version    INTEGER NOT NULL,
+    page_count INTEGER NOT NULL,
+    PRIMARY KEY (pdf_hash, method, version)
+);
+CREATE INDEX IF NOT EXISTS idx_pages_last_used ON pages(last_used);
+"""
+
+
+def file_sha256(path, chunk_size: int = 1 << 20) -> str:
+    """SHA-256 del archivo completo (identidad del PDF, no su nombre)."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class PageCache:
+    """
+    Cache en disco (SQLite) del texto extraído por página.
+    Llave: (sha256 del PDF, método + parámetros, versión del extractor, página).
+    Al superar max_bytes se eliminan las entradas usadas hace más tiempo.
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.conn = sqlite3.connect(str(self.path), timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(_SCHEMA)
+
+    def get_pages(self, pdf_hash: str, method: str, version: int) -> dict:
+        """
+        Retorna: {page_number: (text, used_method)} con lo que haya en cache.
+        """
+        rows = self.conn.execute(
+            "SELECT page, text, used FROM pages "
+            "WHERE pdf_hash = ? AND method = ? AND version = ?",
+            (pdf_hash, method, version),
+        ).fetchall()
+
+        if rows:
+            self.conn.execute(
+                "UPDATE pages SET last_used = ? "
+                "WHERE pdf_hash = ? AND method = ? AND version = ?",
+                (time.time(), pdf_hash, method, version),
+            )
+            self.conn.commit()
+
+        return {page: (text, used) for page, text, used in rows}
+
+    def get_page(self, pdf_hash: str, method: str, version: int,
+                 page: int) -> tuple[str, str] | None:
+        """Retorna (text, used_method) de una página, o None si no está."""
+        row = self.conn.execute(
+            "SELECT text, used FROM pages "
+            "WHERE pdf_hash = ? AND method = ? AND version = ? AND page = ?",
+            (pdf_hash, method, version, page),
+        ).fetchone()
+        return tuple(row) if row else None
+
+    def cached_page_numbers(self, pdf_hash: str, method: str, version: int) -> set:
+        rows = self.conn.execute(
+            "SELECT page FROM pages "
+            "WHERE pdf_hash = ? AND method = ? AND version = ?",
+            (pdf_hash, method, version),
+        )
+        return {page for (page,) in rows}
+
+    def iter_pages(self, pdf_hash: str, method: str, version: int):
+        """
+        Recorre las páginas cacheadas en orden sin cargarlas todas a memoria.
+        Genera: (page_number, text, used_method)
+        """
+        self.conn.execute(
+            "UPDATE pages SET last_used = ? "
+            "WHERE pdf_hash = ? AND method = ? AND version = ?",
+            (time.time(), pdf_hash, method, version),
+        )
+        self.conn.commit()
+
+        yield from self.conn.execute(
+            "SELECT page, text, used FROM pages "
+            "WHERE pdf_hash = ? AND method = ? AND version = ? ORDER BY page",
+            (pdf_hash, method, version),
+        )
+
+    def get_page_count(self, pdf_hash: str, method: str, version: int) -> int | None:
+        row = self.conn.execute(
+            "SELECT page_count FROM documents "
+            "WHERE pdf_hash = ? AND method = ? AND version = ?",
+            (pdf_hash, method, version),
+        ).fetchone()
+        return row[0] if row else None
+
+    def put_pages(self, pdf_hash: str, method: str, version: int,
+                  pages: dict, page_count: int | None = None):
+        """
+        pages = {page_number: (text, used_method)}
+        """
+        now = time.time()
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO pages "
+            "(pdf_hash, method, version, page, text, used, size, last_used) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            [
+                (pdf_hash, method, version, page, text, used,
+                 len(text.encode("utf-8")), now)
+                for page, (text, used) in pages.items()
+            ],
+        )
+        if page_count is not None:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO documents "
+                "(pdf_hash, method, version, page_count) VALUES (?, ?, ?, ?)",
+                (pdf_hash, method, version, page_count),
+            )
+        self.conn.commit()
+        self.evict()
+
+    def total_bytes(self) -> int:
+        return self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM pages").fetchone()[0]
+
+    def evict(self):
+        """Si el cache excede max_bytes, borra las páginas menos usadas hasta el 90%."""
+        total = self.total_bytes()
+        if total <= self.max_bytes:
+            return
+
+        target = int(self.max_bytes * 0.9)
+        victims = []
+        rows = self.conn.execute(
+            "SELECT rowid, size FROM pages ORDER BY last_used ASC"
+        )
+        for rowid, size in rows:
+            if total <= target:
+                break
+            victims.append((rowid,))
+            total -= size
+
+        self.conn.executemany("DELETE FROM pages WHERE rowid = ?", victims)
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+
+def iter_with_cache(pdf_path, method: str, version: int, extract_page,
+                    cache: PageCache | None = None):
+    """
+    Versión generador de extract_with_cache: produce cada página en cuanto
+    está lista (desde el cache o recién extraída), en orden.
+    Genera: (page_number, text, used_method, from_cache)
+    """
+    own_cache = cache is None
+    cache = cache or PageCache()
+
+    try:
+        pdf_hash = file_sha256(pdf_path)
+        page_count = cache.get_page_count(pdf_hash, method, version)
+        cached = cache.cached_page_numbers(pdf_hash, method, version)
+
+        # Documento completo en cache: ni siquiera se abre el PDF
+        if page_count is not None and len(cached) >= page_count:
+            for page, text, used in cache.iter_pages(pdf_hash, method, version):
+                yield page, text, used, True
+            return
+
+        import fitz  # PyMuPDF
+
+        doc = fitz.open(str(pdf_path))
+        pending = {}
+        complete = False
+        try:
+            for i, page in enumerate(doc):
+                hit = cache.get_page(pdf_hash, method, version, i+1) if i+1 in cached else None
+                if hit:
+                    yield i+1, hit[0], hit[1], True
+                    continue
+
+                text, used = extract_page(page)
+                pending[i+1] = (text, used)
+                if len(pending) >= FLUSH_EVERY:
+                    cache.put_pages(pdf_hash, method, version, pending)
+                    pending = {}
+
+                yield i+1, text, used, False
+            complete = True
+        finally:
+            # También guarda lo avanzado si el consumidor se detiene antes
+            cache.put_pages(pdf_hash, method, version, pending,
+                            len(doc) if complete else None)
+            doc.close()
+    finally:
+        if own_cache:
+            cache.close()
+
+
+def extract_with_cache(pdf_path, method: str, version: int, extract_page,
+                       cache: PageCache | None = None) -> dict:
+    """
+    Extrae {page_number: text} leyendo primero del cache.
+    extract_page(page) -> (text, used_method) solo se llama para las
+    páginas que falten; si el documento está completo ni siquiera se abre el PDF.
+    """
+    return {
+        page: text
+        for page, text, _used, _cached in iter_with_cache(
+            pdf_path, method, version, extract_page, cache=cache
+        )
+    }
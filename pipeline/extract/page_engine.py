@@ -0,0 +1,102 @@
+# pipeline/extract/page_engine.py
+
+import fitz  # PyMuPDF
+
+from .ocr_extractor import ocr_page
+from .hybrid_extractor import extract_page_hybrid, image_regions
+from .page_cache import PageCache, iter_with_cache
+from .metrics import track_page
+
+# Heurística por página: menos de N caracteres nativos → probablemente escaneada
+MIN_TEXT_CHARS = 20
+
+# Subir cuando cambie la salida del motor (invalida el cache de páginas)
+EXTRACTOR_VERSION = 1
+
+
+def page_is_image(page, native_text: str) -> bool:
+    """
+    Decide si una página es imagen usando el texto nativo ya extraído.
+    Una página casi vacía pero sin imágenes (p. ej. en blanco) no se manda a OCR.
+    """
+    if len(native_text.strip()) > MIN_TEXT_CHARS:
+        return False
+    return bool(page.get_images())
+
+
+def extract_page(page, dpi: int = 300, hybrid: bool = False) -> tuple[str, str]:
+    """
+    Extrae una página ya abierta.
+    Con hybrid, las páginas con texto nativo e imágenes grandes también
+    hacen OCR, pero solo de las regiones de imagen.
+    Retorna: (text, method) con method = "native", "ocr" o "hybrid"
+    """
+    text = page.get_text("text")
+    if page_is_image(page, text):
+        return ocr_page(page, dpi=dpi), "ocr"
+    if hybrid and image_regions(page):
+        return extract_page_hybrid(page, dpi=dpi), "hybrid"
+    return text, "native"
+
+
+def engine_method(dpi: int = 300, lang: str = "spa", hybrid: bool = False) -> str:
+    """Identificador del método + parámetros, usado como llave de cache."""
+    method = f"auto:min{MIN_TEXT_CHARS}:ocr-dpi{dpi}:{lang}"
+    return method + ":hybrid" if hybrid else method
+
+
+def iter_pdf_pages_single_pass(pdf_path: str, dpi: int = 300,
+                               cache: PageCache | None = None, hybrid: bool = False):
+    """
+    Generador del motor de una sola pasada: produce cada página en cuanto
+    termina (texto nativo, OCR o cache), sin esperar al resto del documento.
+    Genera: (page_number, text, meta) con meta = {"method": ..., "cached": bool}
+    """
+    def _extract(page):
+        with track_page("extract_pdf", pdf_path, page.number + 1) as rec:
+            text, method = extract_page(page, dpi=dpi, hybrid=hybrid)
+            rec.update(method=method, chars=len(text),
+                       dpi=None if method == "native" else dpi)
+        return text, method
+
+    if cache is not None:
+        for page_number, text, method, cached in iter_with_cache(
+            pdf_path, engine_method(dpi, hybrid=hybrid), EXTRACTOR_VERSION,
+            _extract, cache=cache,
+        ):
+            if cached:
+                with track_page("extract_pdf", pdf_path, page_number, method="cache") as rec:
+                    rec["chars"] = len(text)
+            yield page_number, text, {"method": method, "cached": cached}
+        return
+
+    doc = fitz.open(pdf_path)
+    try:
+        for page in doc:
+            text, method = _extract(page)
+            yield page.number + 1, text, {"method": method, "cached": False}
+    finally:
+        doc.close()
+
+
+def extract_pdf_single_pass(pdf_path: str, dpi: int = 300,
+                            cache: PageCache | None = None, hybrid: bool = False) -> dict:
+    """
+    Abre el PDF una sola vez y decide página por página:
+    - Texto nativo si la página lo tiene.
+    - OCR solo para las páginas que son imagen.
+    - Con hybrid, OCR solo de las imágenes de las páginas mixtas.
+    Con cache, las páginas ya extraídas se leen de disco.
+    Retorna: {page_number: text}
+    """
+    pages = {}
+    methods = {"native": 0, "ocr": 0, "hybrid": 0, "cache": 0}
+
+    for page_number, text, meta in iter_pdf_pages_single_pass(pdf_path, dpi=dpi, cache=cache,
+                                                              hybrid=hybrid):
+        pages[page_number] = text
+        methods["cache" if meta["cached"] else meta["method"]] += 1
+
+    print(f"Páginas: {methods['native']} texto, {methods['ocr']} OCR, "
+          f"{methods['hybrid']} mixtas, {methods['cache']} cache")
+    return pages
@@ -0,0 +1,57 @@
+# pipeline/extract/page_ranges.py
+
+import math
+from concurrent.futures import ProcessPoolExecutor
+
+import fitz  # PyMuPDF
+
+from .metrics import get_metrics, reset_worker_metrics
+
+
+def page_count(pdf_path: str) -> int:
+    doc = fitz.open(pdf_path)
+    total = len(doc)
+    doc.close()
+    return total
+
+
+def split_page_ranges(total_pages: int, chunk_size: int) -> list:
+    """
+    Divide [0, total_pages) en rangos contiguos de chunk_size páginas.
+    Retorna: [(start, end), ...] con índices base 0, end exclusivo.
+    """
+    chunk_size = max(1, chunk_size)
+    return [
+        (start, min(start + chunk_size, total_pages))
+        for start in range(0, total_pages, chunk_size)
+    ]
+
+
+def extract_ranges_parallel(pdf_path: str, range_fn, workers: int,
+                            chunk_size: int | None = None, **kwargs) -> dict:
+    """
+    Reparte un solo documento en rangos de páginas entre procesos.
+    range_fn(pdf_path, start, end, **kwargs) debe ser una función de módulo
+    que abra su propio fitz.Document y retorne
+    ([(page_number, text), ...], get_metrics().drain()): las métricas por
+    página del worker se agregan al colector de este proceso.
+    Default: ~4 rangos por worker, para balancear páginas lentas.
+    Retorna: {page_number: text} en orden de página
+    """
+    total = page_count(pdf_path)
+    if chunk_size is None:
+        chunk_size = math.ceil(total / (workers * 4)) if total else 1
+
+    ranges = split_page_ranges(total, chunk_size)
+    pages = {}
+
+    metrics = get_metrics()
+    with ProcessPoolExecutor(max_workers=workers, initializer=reset_worker_metrics) as pool:
+        futures = [pool.submit(range_fn, pdf_path, start, end, **kwargs) for start, end in ranges]
+        # Se recorren en el orden de envío: el dict y las métricas quedan en orden de página
+        for fut in futures:
+            range_pages, records = fut.result()
+            pages.update(range_pages)
+            metrics.extend(records)
+
+    return pages
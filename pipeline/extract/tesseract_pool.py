@@ -0,0 +1,110 @@
+# pipeline/extract/tesseract_pool.py
+
+import io
+import os
+import subprocess
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+
+import numpy as np
+import pytesseract
+from PIL import Image
+
+# Backend persistente opcional: un motor tesseract vivo por proceso
+try:
+    import tesserocr
+    HAS_TESSEROCR = True
+except ImportError:
+    HAS_TESSEROCR = False
+
+# Separador de páginas que tesseract escribe al final de cada imagen
+PAGE_SEPARATOR = "\f"
+
+_API = None  # motor tesserocr del proceso worker
+
+
+def _init_tesserocr(lang: str):
+    global _API
+    _API = tesserocr.PyTessBaseAPI(lang=lang)
+
+
+def _tesserocr_batch(buffers: list) -> list:
+    """Worker persistente: OCR desde buffers crudos (bytes, width, height, channels)."""
+    texts = []
+    for data, width, height, channels in buffers:
+        _API.SetImageBytes(data, width, height, channels, width * channels)
+        texts.append(_API.GetUTF8Text())
+    return texts
+
+
+def _cli_batch(images: list, lang: str, cmd: str) -> list:
+    """
+    Una sola invocación de tesseract para varias imágenes: se mandan como
+    TIFF multipágina por stdin (en memoria, sin archivos temporales).
+    """
+    frames = [Image.fromarray(img) for img in images]
+    buf = io.BytesIO()
+    frames[0].save(buf, format="TIFF", save_all=True, append_images=frames[1:])
+
+    result = subprocess.run(
+        [cmd, "stdin", "stdout", "-l", lang],
+        input=buf.getvalue(),
+        capture_output=True,
+        check=True,
+    )
+    texts = result.stdout.decode("utf-8", errors="replace").split(PAGE_SEPARATOR)
+    texts += [""] * (len(images) - len(texts))
+    return texts[:len(images)]
+
+
+class TesseractPool:
+    """
+    Pool de OCR de larga vida para muchas páginas:
+    - Con tesserocr: procesos que mantienen un motor tesseract inicializado
+      y reciben los píxeles crudos en memoria.
+    - Sin tesserocr: agrupa imágenes en un TIFF multipágina por invocación
+      del binario de tesseract (stdin/stdout, sin PNG intermedios).
+    Las imágenes son arreglos uint8 (H, W) en gris o (H, W, 3) RGB.
+    """
+
+    def __init__(self, workers: int | None = None, lang: str = "spa"):
+        self.workers = workers or os.cpu_count() or 1
+        self.lang = lang
+        self.persistent = HAS_TESSEROCR
+
+        if self.persistent:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_tesserocr,
+                initargs=(lang,),
+            )
+        else:
+            # Los hilos solo esperan al subproceso: no compiten por el GIL
+            self._executor = ThreadPoolExecutor(max_workers=self.workers)
+            self._cmd = pytesseract.pytesseract.tesseract_cmd
+
+    def submit(self, images: list) -> Future:
+        """Encola un lote de imágenes. El Future resuelve a [text, ...] en el mismo orden."""
+        if self.persistent:
+            buffers = []
+            for img in images:
+                img = np.ascontiguousarray(img, dtype=np.uint8)
+                channels = 1 if img.ndim == 2 else img.shape[2]
+                buffers.append((img.tobytes(), img.shape[1], img.shape[0], channels))
+            return self._executor.submit(_tesserocr_batch, buffers)
+
+        return self._executor.submit(_cli_batch, images, self.lang, self._cmd)
+
+    def ocr_batch(self, images: list) -> list:
+        return self.submit(images).result()
+
+    def ocr_image(self, image) -> str:
+        return self.ocr_batch([image])[0]
+
+    def close(self):
+        self._executor.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
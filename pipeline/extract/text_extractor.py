@@ -1,15 +1,59 @@
 import fitz
 
-def extract_text_from_pdf(pdf_path: str) -> dict:
+from .page_cache import PageCache, extract_with_cache
+from .page_ranges import extract_ranges_parallel
+from .metrics import get_metrics, track_page
+
+# Subir si cambia la forma de extraer texto nativo (invalida el cache)
+NATIVE_VERSION = 1
+
+def _extract_range(pdf_path: str, start: int, end: int) -> tuple:
+    """
+    Worker: abre su propio documento y extrae las páginas [start, end).
+    Retorna: ([(page_number, text), ...], métricas por página)
+    """
+    doc = fitz.open(pdf_path)
+    pages = []
+    try:
+        for i in range(start, end):
+            with track_page("text", pdf_path, i+1, method="native") as rec:
+                text = doc[i].get_text("text")
+                rec["chars"] = len(text)
+            pages.append((i+1, text))
+    finally:
+        doc.close()
+    return pages, get_metrics().drain()
+
+def extract_text_from_pdf(pdf_path: str, workers: int = 1,
+                          chunk_size: int | None = None) -> dict:
     """
     Extrae texto de cada página del PDF.
+    Con workers > 1 reparte el documento en rangos de páginas entre procesos.
     Retorna un diccionario {page_number: text}
     """
+    if workers > 1:
+        # Cada worker mide sus páginas y las métricas regresan con el rango
+        return extract_ranges_parallel(pdf_path, _extract_range, workers, chunk_size)
+
     doc = fitz.open(pdf_path)
     pages = {}
 
     for i, page in enumerate(doc):
-        pages[i+1] = page.get_text("text")
+        with track_page("text", pdf_path, i+1, method="native") as rec:
+            pages[i+1] = page.get_text("text")
+            rec["chars"] = len(pages[i+1])
 
     doc.close()
     return pages
+
+
+def extract_text_cached(pdf_path: str, cache: PageCache | None = None) -> dict:
+    """
+    Igual que extract_text_from_pdf, pero leyendo/guardando en el cache de páginas.
+    Retorna un diccionario {page_number: text}
+    """
+    return extract_with_cache(
+        pdf_path, "native", NATIVE_VERSION,
+        lambda page: (page.get_text("text"), "native"),
+        cache=cache,
+    )
@@ -0,0 +1,17 @@
+# pipeline/parse/corpus_scan.py
+
+# Separador entre páginas. No es espacio (\s no lo cruza), no es palabra
+# (\b funciona igual que en el borde de la página) y no es \n (un \s*
+# inicial no absorbe nada de la página anterior).
+PAGE_SEP = "\x00"
+
+
+def join_pages(texts) -> str:
+    """
+    Todas las páginas de un documento en un solo buffer, separadas por
+    PAGE_SEP: cada patrón corre una sola vez (findall) sobre el documento
+    completo en lugar de una llamada por página.
+    Patrones con "." o $ pueden cruzar PAGE_SEP: usar [^\\S\\n] / (?=\\n|\\x00|\\Z).
+    texts: textos de las páginas, en orden.
+    """
+    return PAGE_SEP.join(texts)
@@ -0,0 +1,107 @@
+# pipeline/parse/layout_assoc.py
+
+import numpy as np
+
+from ..text.lexer import tokenize, PRICE_KINDS
+
+# Igual que los parsers: precios menores son ruido (2, 5, 10...)
+MIN_PRICE = 20
+
+# Peso de la distancia horizontal: cruzar de columna cuesta más que bajar líneas
+X_WEIGHT = 3.0
+
+
+def box_centers(boxes: np.ndarray) -> np.ndarray:
+    """(n, 4) → (n, 2) con el centro de cada caja."""
+    return np.stack([
+        (boxes[:, 0] + boxes[:, 2]) / 2,
+        (boxes[:, 1] + boxes[:, 3]) / 2,
+    ], axis=1)
+
+
+def nearest(src: np.ndarray, dst: np.ndarray, x_weight: float = X_WEIGHT):
+    """
+    Vecino más cercano de cada punto src (m, 2) entre dst (k, 2), en una sola operación.
+    Retorna: (idx (m,), dist (m,))
+    """
+    if len(src) == 0 or len(dst) == 0:
+        return np.empty(0, np.int64), np.empty(0, np.float32)
+
+    d = src[:, None, :] - dst[None, :, :]
+    dist = (d[..., 0] * x_weight) ** 2 + d[..., 1] ** 2
+    idx = dist.argmin(axis=1)
+    return idx, dist[np.arange(len(src)), idx]
+
+
+def closest_per_target(idx: np.ndarray, dist: np.ndarray, n_targets: int) -> np.ndarray:
+    """
+    De todos los src asignados a cada target, el más cercano.
+    Retorna: (n_targets,) con el índice del src, o -1 si no tiene ninguno.
+    """
+    best = np.full(n_targets, -1, dtype=np.int64)
+    if len(idx) == 0:
+        return best
+
+    order = np.lexsort((dist, idx))
+    first = np.unique(idx[order], return_index=True)[1]
+    best[idx[order][first]] = order[first]
+    return best
+
+
+def associate_layout(texts: list, boxes: np.ndarray) -> list:
+    """
+    Asigna cada token de precio y de puntos a su SKU más cercano en la página.
+    texts/boxes: líneas de PageLayout.lines()
+    Retorna:
+    [
+        {"sku": "...", "line": i, "price": float | None, "points": int | None}
+    ]
+    """
+    sku_vals, sku_lines = [], []
+    price_vals, price_lines = [], []
+    points_vals, points_lines = [], []
+
+    # Una sola pasada del lexer sobre todas las líneas; los SKUs ya son
+    # tokens aparte y no se confunden con precio/puntos
+    joined = "\n".join(texts)
+    for tok in tokenize(joined):
+        if tok.kind == "SKU":
+            sku_vals.append(tok.value)
+            sku_lines.append(tok.line)
+        elif tok.kind == "POINTS":
+            points_vals.append(tok.value)
+            points_lines.append(tok.line)
+        # En layout solo cuentan los precios con "$"
+        elif (tok.kind in PRICE_KINDS and tok.value >= MIN_PRICE
+              and "$" in joined[tok.start:tok.end]):
+            price_vals.append(tok.value)
+            price_lines.append(tok.line)
+
+    if not sku_vals:
+        return []
+
+    # Los targets son las líneas con SKU, sin repetir: dos SKUs en la misma
+    # línea tienen el mismo centro y comparten precio y puntos (con un
+    # target por SKU, el empate siempre lo ganaría el primero)
+    lines = list(dict.fromkeys(sku_lines))
+    target = {line: t for t, line in enumerate(lines)}
+
+    centers = box_centers(boxes)
+    line_xy = centers[lines]
+
+    idx, dist = nearest(centers[price_lines], line_xy)
+    best_price = closest_per_target(idx, dist, len(lines))
+
+    idx, dist = nearest(centers[points_lines], line_xy)
+    best_points = closest_per_target(idx, dist, len(lines))
+
+    out = []
+    for sku, line in zip(sku_vals, sku_lines):
+        t = target[line]
+        out.append({
+            "sku": sku,
+            "line": line,
+            "price": price_vals[best_price[t]] if best_price[t] >= 0 else None,
+            "points": points_vals[best_points[t]] if best_points[t] >= 0 else None,
+        })
+    return out
@@ -1,36 +1,218 @@
 # pipeline/parse/page_router.py
 
+import math
+from array import array
+from contextlib import nullcontext
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+
 from .parser_product_simple import ParserProductSimple
 from .parser_tones_list import ParserTonesList
 from .parser_combo import ParserCombo
 from .parser_de_to_a import ParserDeToA
 from .parser_holistic_life import ParserHolisticLife
+from .product_table import ProductTable
+from .parse_cache import ParseCache, parse_key
+from ..clean.prepared_page import PreparedPage, prepare_page
+
+# Páginas sin contenido útil para parsear
+SKIP_TYPES = ("UNKNOWN", "PROMO_BANNER")
+
+# Páginas por lote cuando no se conoce el total (pages es un iterador)
+PARSE_BATCH = 16
+
+
+def _parse_group(parser, items: list) -> list:
+    """
+    Worker: parsea un grupo de páginas del mismo tipo con un solo parser.
+    items: [(page_number, page_text, page_meta), ...]
+    Retorna: [(page_number, [productos]), ...]
+    """
+    return [(page, parser.parse(prepare_page(text), meta)) for page, text, meta in items]
+
 
 class PageRouter:
 
-    def __init__(self):
+    def __init__(self, product_simple_mode: str = "window", cache: ParseCache | None = None):
+        """
+        product_simple_mode: "window" o "sweep" (ver ParserProductSimple).
+        cache: ParseCache opcional; las páginas ya parseadas con la misma
+        versión del parser no se vuelven a parsear.
+        """
         self.parsers = {
-            "PRODUCT_SIMPLE": ParserProductSimple(),
+            "PRODUCT_SIMPLE": ParserProductSimple(mode=product_simple_mode),
             "TONES_LIST": ParserTonesList(),
             "COMBO": ParserCombo(),
             "DE_TO_A": ParserDeToA(),
             "PROMO_BANNER": None,
             "UNKNOWN": None
         }
+        self.holistic = ParserHolisticLife()
+        self.cache = cache
 
     def parse_page(self, page_text: str, page_meta: dict, pdf_name: str):
         """
         page_meta = {"page": int, "detected_type": "..."}
+        page_text: texto crudo o PreparedPage; se prepara una sola vez
+        y el mismo objeto llega al parser.
         """
         t = page_meta["detected_type"]
 
         # Holistic Life: parser especial
         if "Holistic" in pdf_name:
-            return ParserHolisticLife().parse(page_text, page_meta)
-
-        parser = self.parsers.get(t)
+            parser = self.holistic
+        else:
+            parser = self.parsers.get(t)
 
         if parser is None:
             return []  # Banners, unknown, páginas de sección, etc.
 
-        return parser.parse(page_text, page_meta)
+        if self.cache is None:
+            return parser.parse(prepare_page(page_text), page_meta)
+
+        raw = page_text.raw if isinstance(page_text, PreparedPage) else page_text
+        key = parse_key(raw, t, parser)
+        products = self.cache.get(key, page_meta["page"])
+        if products is not None:
+            self.cache.touch_many([key])
+            return products
+
+        products = parser.parse(prepare_page(page_text), page_meta)
+        self.cache.put_many([(key, products)])
+        return products
+
+    def parse_document(
+        self,
+        pages,
+        classification: dict,
+        pdf_name: str,
+        workers: int = 1,
+        skip_types: tuple = SKIP_TYPES,
+        table: ProductTable | None = None,
+    ):
+        """
+        Parsea un catálogo completo en una sola llamada.
+        pages: {page_number: text} o iterable de (page_number, text)
+        classification: *_classification.json del classifier ({"pages": {...}})
+        - El ruteo por documento (Holistic) se decide una sola vez.
+        - Con cache, las páginas ya parseadas se leen de ahí y solo el resto
+          va a los parsers; los resultados de cada lote se guardan en una
+          transacción en cuanto el lote termina.
+        - Las páginas se agrupan por detected_type; en cuanto un grupo junta
+          un lote, el lote se parsea (o va al pool de procesos con
+          workers > 1, con a lo más 2 lotes por worker en vuelo) mientras
+          `pages` se sigue consumiendo. Al final van los lotes incompletos.
+        Retorna: lista de productos en orden de página; con `table`, los
+        productos de cada lote se agregan a esa ProductTable en cuanto el
+        lote termina (sin juntar los dicts de todo el documento) y al final
+        las filas nuevas se ordenan por página; se retorna la tabla.
+        """
+        total = None
+        if isinstance(pages, dict):
+            total = len(pages)
+            pages = pages.items()
+
+        # Con el total conocido, ~4 lotes por worker para balancear tipos con
+        # muchas páginas; si no, lotes fijos de PARSE_BATCH
+        if total and workers > 1:
+            batch_size = max(1, math.ceil(total / (workers * 4)))
+        else:
+            batch_size = PARSE_BATCH
+
+        holistic = "Holistic" in pdf_name
+        page_types = classification["pages"]
+
+        cache = self.cache
+        cached, hit_keys, miss_keys = [], [], {}
+
+        # Con tabla, cada lote va directo a sus columnas; row_pages guarda la
+        # página de cada fila nueva para ordenarlas al final
+        results = []
+        start = len(table) if table is not None else 0
+        row_pages = array("q")
+
+        def collect(group, fresh=True):
+            if cache is not None and fresh:
+                cache.put_many([(miss_keys.pop(page), products) for page, products in group])
+            if table is None:
+                results.append(group)
+                return
+            for page, products in group:
+                for product in products:
+                    table.append(product)
+                    row_pages.append(page)
+
+        groups = {}
+        pending = set()
+
+        with ProcessPoolExecutor(max_workers=workers) if workers > 1 else nullcontext() as pool:
+
+            def submit(parser, items):
+                if pool is None:
+                    collect(_parse_group(parser, items))
+                    return
+                pending.add(pool.submit(_parse_group, parser, items))
+                # Lo ya terminado se recoge sin esperar; con más de 2 lotes
+                # por worker en vuelo se espera a que termine alguno
+                while pending:
+                    full = len(pending) > 2 * workers
+                    done, _ = wait(pending, timeout=None if full else 0,
+                                   return_when=FIRST_COMPLETED)
+                    if not done:
+                        break
+                    for fut in done:
+                        pending.discard(fut)
+                        collect(fut.result())
+
+            for page_number, text in pages:
+                meta = page_types.get(str(page_number))
+                if not meta:
+                    continue
+
+                detected_type = meta["detected_type"]
+                if detected_type in skip_types:
+                    continue
+
+                parser = self.holistic if holistic else self.parsers.get(detected_type)
+                if parser is None:
+                    continue
+
+                if cache is not None:
+                    cache_key = parse_key(text, detected_type, parser)
+                    products = cache.get(cache_key, page_number)
+                    if products is not None:
+                        cached.append((page_number, products))
+                        hit_keys.append(cache_key)
+                        continue
+                    miss_keys[page_number] = cache_key
+
+                page_meta = {"page": page_number, "detected_type": detected_type}
+                key = "HOLISTIC" if holistic else detected_type
+                items = groups.setdefault(key, (parser, []))[1]
+                items.append((page_number, text, page_meta))
+                if len(items) >= batch_size:
+                    submit(parser, items[:])
+                    items.clear()
+
+            # Lotes incompletos de cada tipo
+            for parser, items in groups.values():
+                if items:
+                    submit(parser, items)
+
+            for fut in wait(pending).done:
+                collect(fut.result())
+
+        if cache is not None:
+            cache.touch_many(hit_keys)
+        collect(cached, fresh=False)
+
+        if table is not None:
+            # Orden estable por página: dentro de una página, el del parser
+            new_rows = sorted(range(len(row_pages)), key=row_pages.__getitem__)
+            table.reorder(list(range(start)) + [start + i for i in new_rows])
+            return table
+
+        by_page = sorted(
+            (item for group in results for item in group),
+            key=lambda item: item[0],
+        )
+        return [product for _page, products in by_page for product in products]
@@ -0,0 +1,189 @@
+# pipeline/parse/page_rules.py
+
+import operator
+from functools import reduce
+from pathlib import Path
+
+import numpy as np
+
+# -------------------------------------------------------------
+# Columnas de la matriz de features: una fila por página
+# -------------------------------------------------------------
+FEATURES = (
+    "line_count",      # líneas no vacías
+    "sku_count",       # SKUs únicos (paréntesis, o números sueltos si no hay)
+    "price_count",
+    "percent_count",
+    "has_points",      # banderas: 0 / 1
+    "has_promo_tag",
+    "has_combo",
+    "has_legal",
+    "has_de_a",
+    "tone_lines",      # líneas que terminan en (12345)
+)
+COL = {name: i for i, name in enumerate(FEATURES)}
+
+# Umbrales con nombre: se pueden reajustar sin tocar RULES
+THRESHOLDS = {
+    "tone_lines_min": 3,
+    "sku_count_min": 6,
+}
+
+# -------------------------------------------------------------
+# Reglas en orden: gana la primera cuyas condiciones se cumplen todas.
+# Condición = (feature, operador, valor); el valor es un número o el
+# nombre de un umbral de THRESHOLDS. Un "o" se escribe como dos reglas
+# seguidas con el mismo tipo (TONES_LIST).
+# -------------------------------------------------------------
+RULES = [
+    ("EMPTY", (("line_count", "==", 0),)),
+    ("LEGAL", (("has_legal", "!=", 0), ("sku_count", "==", 0), ("price_count", "==", 0))),
+    ("PROMO_BANNER", (("has_promo_tag", "!=", 0), ("sku_count", "==", 0))),
+    ("COMBO", (("has_combo", "!=", 0),)),
+    ("TONES_LIST", (("tone_lines", ">=", "tone_lines_min"),)),
+    ("TONES_LIST", (("sku_count", ">=", "sku_count_min"),)),
+    ("DE_TO_A", (("has_de_a", "!=", 0),)),
+    ("PRODUCT_SIMPLE", (("sku_count", ">=", 1), ("price_count", ">=", 1))),
+    ("SKU_ONLY", (("sku_count", ">=", 1), ("price_count", "==", 0))),
+    ("PROMO_BANNER", (("has_promo_tag", "!=", 0), ("percent_count", ">=", 1))),
+]
+DEFAULT_TYPE = "UNKNOWN"
+
+TYPES = tuple(dict.fromkeys([dtype for dtype, _ in RULES] + [DEFAULT_TYPE]))
+TYPE_CODE = {dtype: i for i, dtype in enumerate(TYPES)}
+
+# Mismos operadores para un int (classify_row) y una columna (classify_matrix)
+_OPS = {
+    "==": operator.eq,
+    "!=": operator.ne,
+    ">=": operator.ge,
+    "<=": operator.le,
+    ">": operator.gt,
+    "<": operator.lt,
+}
+
+
+def _thresholds(thresholds: dict | None) -> dict:
+    if not thresholds:
+        return THRESHOLDS
+    unknown = set(thresholds) - set(THRESHOLDS)
+    if unknown:
+        raise ValueError(f"Umbrales desconocidos: {sorted(unknown)}")
+    return {**THRESHOLDS, **thresholds}
+
+
+def _compile(thresholds: dict | None) -> list:
+    """RULES con el índice de columna, la función del operador y el valor resuelto."""
+    values = _thresholds(thresholds)
+    return [
+        (TYPE_CODE[dtype], [
+            (COL[feature], _OPS[op], values[value] if isinstance(value, str) else value)
+            for feature, op, value in conditions
+        ])
+        for dtype, conditions in RULES
+    ]
+
+
+_DEFAULT_RULES = _compile(None)  # con THRESHOLDS: se compila una vez
+
+
+def classify_row(row, thresholds: dict | None = None) -> str:
+    """Tipo de una página: row alineada con FEATURES (tupla o fila de la matriz)."""
+    for code, conditions in _compile(thresholds) if thresholds else _DEFAULT_RULES:
+        for col, op, value in conditions:
+            if not op(row[col], value):
+                break
+        else:
+            return TYPES[code]
+    return DEFAULT_TYPE
+
+
+def classify_matrix(values: np.ndarray, thresholds: dict | None = None) -> np.ndarray:
+    """
+    Las mismas reglas como máscaras sobre todas las filas a la vez.
+    values: (n, len(FEATURES)). Retorna (n,) con el código de tipo (TYPES).
+    """
+    values = np.asarray(values)
+    conds, codes = [], []
+    for code, conditions in _compile(thresholds) if thresholds else _DEFAULT_RULES:
+        masks = (op(values[:, col], value) for col, op, value in conditions)
+        conds.append(reduce(np.logical_and, masks))
+        codes.append(code)
+    # np.select: en cada fila, el código de la primera condición verdadera
+    return np.select(conds, codes, default=TYPE_CODE[DEFAULT_TYPE]).astype(np.uint8)
+
+
+def type_names(codes: np.ndarray) -> list:
+    """Códigos de classify_matrix → nombres de tipo."""
+    return np.asarray(TYPES, dtype=object)[codes].tolist()
+
+
+class FeatureMatrix:
+    """
+    Features de todas las páginas de una corrida: values (n, len(FEATURES))
+    int32 y, por fila, el PDF y el número de página. Se guarda en .npz
+    junto con el tipo detectado al extraer, para re-clasificar sin volver
+    a leer los PDFs (scripts/reclassify_pages.py).
+    """
+
+    __slots__ = ("values", "pdfs", "pages", "types")
+
+    def __init__(self, values=None, pdfs=(), pages=(), types=None):
+        if values is None:
+            values = np.zeros((0, len(FEATURES)), dtype=np.int32)
+        self.values = np.asarray(values, dtype=np.int32).reshape(-1, len(FEATURES))
+        self.pdfs = np.asarray(pdfs, dtype=str)
+        self.pages = np.asarray(pages, dtype=np.int32)
+        self.types = (classify_matrix(self.values) if types is None
+                      else np.asarray(types, dtype=np.uint8))
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def column(self, name: str) -> np.ndarray:
+        return self.values[:, COL[name]]
+
+    def classify(self, thresholds: dict | None = None) -> np.ndarray:
+        return classify_matrix(self.values, thresholds)
+
+    @classmethod
+    def stack(cls, parts) -> "FeatureMatrix":
+        """Una sola matriz con las de varios PDFs (en ese orden)."""
+        parts = list(parts)
+        if not parts:
+            return cls()
+        return cls(
+            np.concatenate([p.values for p in parts]),
+            np.concatenate([p.pdfs for p in parts]),
+            np.concatenate([p.pages for p in parts]),
+            np.concatenate([p.types for p in parts]),
+        )
+
+    def save(self, path) -> Path:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Nombres de columnas y tipos viajan con los datos: el orden puede cambiar
+        np.savez_compressed(
+            path,
+            values=self.values,
+            pdfs=self.pdfs,
+            pages=self.pages,
+            types=np.asarray(type_names(self.types)),
+            features=np.asarray(FEATURES),
+        )
+        return path
+
+    @classmethod
+    def load(cls, path) -> "FeatureMatrix":
+        with np.load(path) as data:
+            saved = list(data["features"])
+            missing = [f for f in FEATURES if f not in saved]
+            if missing:
+                raise ValueError(
+                    f"{path}: faltan columnas {missing}; vuelve a correr page_classifier.py"
+                )
+            values = data["values"][:, [saved.index(f) for f in FEATURES]]
+            # Un tipo que ya no existe en RULES cuenta como DEFAULT_TYPE
+            default = TYPE_CODE[DEFAULT_TYPE]
+            types = [TYPE_CODE.get(t, default) for t in data["types"]]
+            return cls(values, data["pdfs"], data["pages"], types)
@@ -0,0 +1,151 @@
+# pipeline/parse/parse_cache.py
+
+import hashlib
+import json
+import sqlite3
+import time
+from pathlib import Path
+
+from ..text import lexer
+from ..clean.prepared_page import PREPARE_VERSION
+
+DEFAULT_CACHE_PATH = Path("output/cache/parse_results.sqlite")
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024  # 256 MB de JSON
+
+# Versión del código común a todos los parsers: lexer y preparación de
+# líneas. Un cambio ahí altera la salida aunque ningún parser suba VERSION.
+SHARED_VERSION = f"lexer{lexer.VERSION}.prepare{PREPARE_VERSION}"
+
+# Al cambiar las columnas de la llave, los caches existentes se descartan
+_SCHEMA_VERSION = 2
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    text_hash     TEXT    NOT NULL,
+    detected_type TEXT    NOT NULL,
+    parser        TEXT    NOT NULL,
+    version       INTEGER NOT NULL,
+    shared        TEXT    NOT NULL,
+    products      TEXT    NOT NULL,
+    size          INTEGER NOT NULL,
+    last_used     REAL    NOT NULL,
+    PRIMARY KEY (text_hash, detected_type, parser, version, shared)
+);
+CREATE INDEX IF NOT EXISTS idx_results_last_used ON results(last_used);
+"""
+
+
+def text_hash(text: str) -> str:
+    """Hash del texto de la página (identidad del contenido, no del PDF ni la página)."""
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def parse_key(text: str, detected_type: str, parser) -> tuple:
+    """Llave del cache: (hash del texto, tipo, parser, versión del parser, SHARED_VERSION)."""
+    return text_hash(text), detected_type, parser.cache_id(), parser.VERSION, SHARED_VERSION
+
+
+class ParseCache:
+    """
+    Cache en disco (SQLite) de los productos que produce cada parser.
+    Llave: (hash del texto de la página, detected_type, parser, VERSION del
+    parser, SHARED_VERSION). Subir VERSION de un parser invalida solo sus
+    entradas; subir lexer.VERSION o PREPARE_VERSION invalida todas.
+    Como la llave es el contenido, una página que se repite en otro ciclo u
+    otro PDF es un hit. source_page se guarda vacío y se rellena al leer.
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.conn = sqlite3.connect(str(self.path), timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        if self.conn.execute("PRAGMA user_version").fetchone()[0] != _SCHEMA_VERSION:
+            self.conn.execute("DROP TABLE IF EXISTS results")
+            self.conn.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+        self.conn.executescript(_SCHEMA)
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: tuple, page: int) -> list | None:
+        """Productos cacheados para la llave (con source_page = page), o None."""
+        row = self.conn.execute(
+            "SELECT products FROM results "
+            "WHERE text_hash = ? AND detected_type = ? AND parser = ? AND version = ? AND shared = ?",
+            key,
+        ).fetchone()
+
+        if row is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        products = json.loads(row[0])
+        for product in products:
+            if "source_page" in product:
+                product["source_page"] = page
+        return products
+
+    def put_many(self, entries: list):
+        """
+        entries = [(key, products), ...] recién parseados, en una sola transacción.
+        """
+        if not entries:
+            return
+
+        now = time.time()
+        rows = []
+        for key, products in entries:
+            data = json.dumps(
+                [{**p, "source_page": None} if "source_page" in p else p for p in products],
+                ensure_ascii=False,
+            )
+            rows.append((*key, data, len(data.encode("utf-8")), now))
+
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO results "
+            "(text_hash, detected_type, parser, version, shared, products, size, last_used) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+        self.conn.commit()
+        self.evict()
+
+    def touch_many(self, keys: list):
+        """Actualiza last_used de los hits (para la política de desalojo)."""
+        if not keys:
+            return
+        now = time.time()
+        self.conn.executemany(
+            "UPDATE results SET last_used = ? "
+            "WHERE text_hash = ? AND detected_type = ? AND parser = ? AND version = ? AND shared = ?",
+            [(now, *key) for key in keys],
+        )
+        self.conn.commit()
+
+    def total_bytes(self) -> int:
+        return self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+
+    def evict(self):
+        """Si el cache excede max_bytes, borra las entradas menos usadas hasta el 90%."""
+        total = self.total_bytes()
+        if total <= self.max_bytes:
+            return
+
+        target = int(self.max_bytes * 0.9)
+        victims = []
+        rows = self.conn.execute(
+            "SELECT rowid, size FROM results ORDER BY last_used ASC"
+        )
+        for rowid, size in rows:
+            if total <= target:
+                break
+            victims.append((rowid,))
+            total -= size
+
+        self.conn.executemany("DELETE FROM results WHERE rowid = ?", victims)
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
@@ -1,9 +1,22 @@
 # pipeline/parse/parse_products.py
 import re
 
+RE_CODE = re.compile(r"\((\d{5,6})\)")
+RE_POINTS = re.compile(r"(\d+)\s*pts")
+
+# Marcadores que descartan una línea como nombre / descripción
+_NOT_TEXT = ("$", "pts", "(", "a:")
+_FOOTERS = (
+    "válido hasta agotar existencias",
+    "valido hasta agotar existencias",
+    "cofepris",
+    "salud es belleza",
+)
+
+
 def is_name(line):
     tokens = line.lower()
-    if any(x in tokens for x in ["$", "pts", "(", "a:"]):
+    if any(x in tokens for x in _NOT_TEXT):
         return False
     return len(line.split()) >= 2
 
@@ -12,12 +25,12 @@ def is_description(line):
     tokens = line.lower()
     return (
         len(line.split()) >= 3 and
-        not any(x in tokens for x in ["$", "pts", "(", "a:"])
+        not any(x in tokens for x in _NOT_TEXT)
     )
 
 
 def is_code(line):
-    return bool(re.search(r"\(\d{5,6}\)", line))
+    return bool(RE_CODE.search(line))
 
 
 def is_price(line):
@@ -30,18 +43,110 @@ def is_price_discount(line):
 
 def is_footer(line):
     tokens = line.lower()
-    return (
-        "válido hasta agotar existencias" in tokens or
-        "valido hasta agotar existencias" in tokens or
-        "cofepris" in tokens or
-        "salud es belleza" in tokens
-    )
+    return any(x in tokens for x in _FOOTERS)
+
+
+# -------------------------------------------------------------
+# Clasificación de línea: una sola pasada (un lower, un split) y el
+# resultado como máscara de bits con los predicados de arriba.
+# -------------------------------------------------------------
+F_NAME = 1        # is_name
+F_DESC = 2        # is_description
+F_CODE = 4        # is_code
+F_DISCOUNT = 8    # is_price_discount
+F_PRICE = 16      # is_price
+F_SKIP = 32       # vacía o pie de página
+
+
+def classify_line(line: str, lower: str | None = None) -> int:
+    """Máscara F_* de una línea ya sin espacios en los extremos."""
+    if not line:
+        return F_SKIP
+    if lower is None:
+        lower = line.lower()
+    # _FOOTERS / _NOT_TEXT desenrollados: cada `in` corre en C
+    if ("existencias" in lower and ("válido hasta agotar existencias" in lower or
+                                    "valido hasta agotar existencias" in lower)) \
+            or "cofepris" in lower or "salud es belleza" in lower:
+        return F_SKIP
+
+    dollar = "$" in line
+    paren = "(" in line
+    mask = 0
+    if not (dollar or paren or "pts" in lower or "a:" in lower):
+        # Solo importa si hay 1, 2 o 3+ palabras
+        words = len(line.split(None, 2))
+        if words >= 2:
+            mask = F_NAME | F_DESC if words == 3 else F_NAME
+    if paren and RE_CODE.search(line):
+        mask |= F_CODE
+    if dollar:
+        mask |= F_PRICE
+        if "a:" in lower:
+            mask |= F_DISCOUNT
+    return mask
+
+
+# -------------------------------------------------------------
+# Máquina de estados por tabla.
+# RULES[estado] = [(bit que debe tener la línea, acción, siguiente estado)]
+# en orden; si ninguna aplica, DEFAULT[estado] = (acción, siguiente). La
+# acción PASS no consume la línea: se evalúa de nuevo en el siguiente
+# estado (nombre → descripcion → codigo, igual que la cadena de ifs).
+# -------------------------------------------------------------
+S_NAME, S_DESC, S_CODE, S_PRICES = range(4)
+
+A_PASS, A_DROP, A_NAME, A_DESC, A_CODE, A_DISCOUNT, A_PRICE, A_NONE = range(8)
+
+RULES = {
+    S_NAME: [(F_NAME, A_NAME, S_NAME)],
+    S_DESC: [(F_DESC, A_DESC, S_DESC)],
+    S_CODE: [(F_CODE, A_CODE, S_PRICES)],
+    S_PRICES: [(F_DISCOUNT, A_DISCOUNT, S_PRICES), (F_PRICE, A_PRICE, S_PRICES)],
+}
+DEFAULT = {
+    S_NAME: (A_PASS, S_DESC),
+    S_DESC: (A_PASS, S_CODE),
+    S_CODE: (A_DROP, S_CODE),
+    S_PRICES: (A_NONE, S_PRICES),
+}
+
+_MASKS = F_SKIP << 1
+
+
+def _build_table() -> list:
+    """
+    TABLE[estado][máscara] = (acción, siguiente estado), con las cadenas de
+    PASS ya resueltas: el recorrido hace un solo acceso por línea.
+    """
+    def step(state, mask):
+        for bit, action, nxt in RULES[state]:
+            if mask & bit:
+                return action, nxt
+        return DEFAULT[state]
+
+    table = []
+    for state in sorted(RULES):
+        row = []
+        for mask in range(_MASKS):
+            if mask & F_SKIP:
+                row.append((A_DROP, state))
+                continue
+            s = state
+            action, nxt = step(s, mask)
+            while action == A_PASS:
+                s = nxt
+                action, nxt = step(s, mask)
+            row.append((action, nxt))
+        table.append(row)
+    return table
 
 
-def parse_products(blocks):
-    products = []
+TABLE = _build_table()
+
 
-    current = {
+def _new_product() -> dict:
+    return {
         "nombre": [],
         "descripcion": [],
         "codigo": None,
@@ -50,60 +155,45 @@ def parse_products(blocks):
         "precio_descuento": None
     }
 
-    state = "nombre"
+
+def parse_products(blocks):
+    """
+    Agrupa líneas de catálogo en productos (nombre, descripción, código,
+    puntos, precio normal y con descuento). Cada línea se clasifica una vez
+    (classify_line) y la máquina de estados solo consulta TABLE.
+    """
+    products = []
+    current = _new_product()
+    state = S_NAME
+    table = TABLE
 
     for line in blocks:
         line = line.strip()
-        if not line or is_footer(line):
-            continue
-
-        if state == "nombre":
-            if is_name(line):
-                current["nombre"].append(line)
-                continue
-            else:
-                state = "descripcion"
+        lower = line.lower()
+        action, state = table[state][classify_line(line, lower)]
 
-        if state == "descripcion":
-            if is_description(line):
-                current["descripcion"].append(line)
-                continue
-            else:
-                state = "codigo"
-
-        if state == "codigo":
-            if is_code(line):
-                code_match = re.search(r"\((\d{5,6})\)", line)
-                if code_match:
-                    current["codigo"] = code_match.group(1)
-                pts_match = re.search(r"(\d+)\s*pts", line.lower())
-                if pts_match:
-                    current["puntos"] = int(pts_match.group(1))
-                state = "precios"
-                continue
-            else:
-                continue
-
-        if state == "precios":
-            if is_price_discount(line):
-                current["precio_descuento"] = float(line.lower().split("$")[1])
-            elif is_price(line):
-                current["precio_normal"] = float(line.split("$")[1])
-
-            if current["codigo"] and current["precio_descuento"] is not None:
+        if action == A_DROP or action == A_NONE:
+            continue
+        if action == A_NAME:
+            current["nombre"].append(line)
+        elif action == A_DESC:
+            current["descripcion"].append(line)
+        elif action == A_CODE:
+            current["codigo"] = RE_CODE.search(line).group(1)
+            pts_match = RE_POINTS.search(lower)
+            if pts_match:
+                current["puntos"] = int(pts_match.group(1))
+        elif action == A_PRICE:
+            current["precio_normal"] = float(line.split("$")[1])
+        else:  # A_DISCOUNT
+            current["precio_descuento"] = float(lower.split("$")[1])
+
+            if current["codigo"]:
                 current["nombre"] = " ".join(current["nombre"]).strip()
                 current["descripcion"] = " ".join(current["descripcion"]).strip()
-
                 products.append(current)
 
-                current = {
-                    "nombre": [],
-                    "descripcion": [],
-                    "codigo": None,
-                    "puntos": None,
-                    "precio_normal": None,
-                    "precio_descuento": None
-                }
-                state = "nombre"
+                current = _new_product()
+                state = S_NAME
 
     return products
@@ -2,15 +2,24 @@
 
 from abc import ABC, abstractmethod
 
+from ..clean.prepared_page import PreparedPage, prepare_page
+
 class ParserBase(ABC):
     """
     Clase base para todos los parsers.
     Todos retornan una lista de productos estandarizados (dict).
+    VERSION: subirla en cada cambio que altere la salida del parser; invalida
+    sus resultados en el cache de parseo (pipeline/parse/parse_cache.py).
+    Los cambios en el código común (lexer.VERSION, PREPARE_VERSION) invalidan
+    los de todos los parsers.
     """
 
+    VERSION = 1
+
     @abstractmethod
-    def parse(self, page_text: str, page_meta: dict) -> list:
+    def parse(self, page_text: str | PreparedPage, page_meta: dict) -> list:
         """
+        page_text: texto crudo o PreparedPage (ver pipeline/clean/prepared_page.py)
         Retorna:
         [
             {
@@ -31,6 +40,17 @@ class ParserBase(ABC):
         """
         pass
 
+    def cache_id(self) -> str:
+        """Identidad del parser en la llave del cache (clase + configuración)."""
+        return type(self).__name__
+
+    def prepare(self, page_text: str | PreparedPage) -> PreparedPage:
+        """Líneas limpias y coincidencias de la página, calculadas una sola vez."""
+        return prepare_page(page_text)
+
     def clean_line(self, line: str) -> str:
-        """Limpieza simple para todas las implementaciones."""
+        """
+        Limpieza simple para todas las implementaciones (PreparedPage.lines
+        hace lo mismo: un cambio aquí sube PREPARE_VERSION).
+        """
         return line.strip().replace("  ", " ")
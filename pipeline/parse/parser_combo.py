@@ -1,35 +1,26 @@
 # pipeline/parse/parser_combo.py
 
-import re
 from .parser_base import ParserBase
-
-RE_SKU = re.compile(r"\(\s*(\d{3,7})\s*\)")
-RE_PRICE = re.compile(r"\$?\s*(\d{2,5}(?:[.,]\d{2})?)")
+from ..text.lexer import PRICE_KINDS
 
 class ParserCombo(ParserBase):
 
-    def parse(self, page_text: str, page_meta: dict) -> list:
-        lines = [self.clean_line(l) for l in page_text.splitlines() if l.strip()]
+    VERSION = 1
+
+    def parse(self, page_text, page_meta: dict) -> list:
+        page = self.prepare(page_text)
+        lines = page.lines
         if not lines:
             return []
 
-        text = "\n".join(lines)
-        # quitar SKUs para no confundirlos con precio
-        text_no_sku = RE_SKU.sub("", text)
-
-        combo_items = []
-        for ln in lines:
-            m = RE_SKU.search(ln)
-            if m:
-                combo_items.append(m.group(1))
+        combo_items = [tok.value for tok in page.first_per_line("SKU").values()]
 
         # precio del combo: tomamos el precio más grande razonable
-        prices = []
-        for m in RE_PRICE.finditer(text_no_sku):
-            val = float(m.group(1).replace(",", "."))
-            if val < 20:
-                continue
-            prices.append(val)
+        # (los SKUs, puntos y % ya son tokens aparte, no precios)
+        prices = [
+            tok.value for tok in page.tokens
+            if tok.kind in PRICE_KINDS and tok.value >= 20
+        ]
 
         price = max(prices) if prices else None
 
@@ -44,9 +35,9 @@ class ParserCombo(ParserBase):
         return [{
             "sku": None,
             "name": name or "Combo/Set",
-            "combo_items": combo_items,
             "price": price,
             "price_before": None,
+            "combo_items": combo_items,
             "source_page": page_meta["page"],
             "detected_type": "COMBO",
         }]
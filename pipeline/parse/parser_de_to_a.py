@@ -1,21 +1,15 @@
 # pipeline/parse/parser_de_to_a.py
 
-import re
 from .parser_base import ParserBase
-
-RE_SKU = re.compile(r"\(\s*(\d{3,7})\s*\)")
-RE_DE = re.compile(r"\bDe\b[:\s]*\$?\s*(\d{2,5}(?:[.,]\d{2})?)", re.I)
-RE_A = re.compile(r"\bA\b[:\s]*\$?\s*(\d{2,5}(?:[.,]\d{2})?)", re.I)
-RE_PERCENT = re.compile(r"(\d{1,3})\s*%", re.I)
-RE_PRICE = re.compile(r"\$?\s*(\d{2,5}(?:[.,]\d{2})?)")
+from ..text.lexer import PRICE_KINDS
 
 class ParserDeToA(ParserBase):
 
-    def parse(self, page_text: str, page_meta: dict) -> list:
-        lines = [self.clean_line(l) for l in page_text.splitlines() if l.strip()]
+    VERSION = 1
 
-        # Remover SKUs para no confundirlos con precios
-        text_no_sku = RE_SKU.sub("", "\n".join(lines))
+    def parse(self, page_text, page_meta: dict) -> list:
+        page = self.prepare(page_text)
+        lines = page.lines
 
         price_before = None
         price_after = None
@@ -23,25 +17,20 @@ class ParserDeToA(ParserBase):
         sku = None
 
         # Intento 1: usar patrones explícitos De/A
-        m_de = RE_DE.search(text_no_sku)
-        m_a = RE_A.search(text_no_sku)
-        if m_de:
-            val = float(m_de.group(1).replace(",", "."))
-            if val >= 20:
-                price_before = val
-        if m_a:
-            val = float(m_a.group(1).replace(",", "."))
-            if val >= 20:
-                price_after = val
+        m_de = page.first("DE")
+        m_a = page.first("A")
+        if m_de and m_de.value >= 20:
+            price_before = m_de.value
+        if m_a and m_a.value >= 20:
+            price_after = m_a.value
 
         # Intento 2: si falta alguno, usar heurística de mayores precios
         if price_before is None or price_after is None:
-            prices = []
-            for m in RE_PRICE.finditer(text_no_sku):
-                val = float(m.group(1).replace(",", "."))
-                if val < 20:
-                    continue
-                prices.append(val)
+            # Los SKUs son tokens aparte: ya no se confunden con precios
+            prices = [
+                tok.value for tok in page.tokens
+                if tok.kind in PRICE_KINDS and tok.value >= 20
+            ]
 
             prices = sorted(set(prices))
             if len(prices) >= 2:
@@ -51,19 +40,15 @@ class ParserDeToA(ParserBase):
             elif len(prices) == 1:
                 price_after = prices[0]
 
-        # porcentaje
-        for ln in lines:
-            p = RE_PERCENT.search(ln)
-            if p:
-                discount = int(p.group(1))
-                break
+        # porcentaje: el de la primera línea que lo tenga
+        p = page.first("PERCENT")
+        if p:
+            discount = p.value
 
         # SKU (si lo hay)
-        for ln in lines:
-            m = RE_SKU.search(ln)
-            if m:
-                sku = m.group(1)
-                break
+        m = page.first("SKU")
+        if m:
+            sku = m.value
 
         # nombre y descripción: de forma simple
         name = None
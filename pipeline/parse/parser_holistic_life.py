@@ -1,23 +1,23 @@
 # pipeline/parse/parser_holistic_life.py
 
 from .parser_base import ParserBase
-import re
-
-RE_PRICE = re.compile(r"\$?\s*(\d{2,5}(?:[.,]\d{2})?)")
+from ..text.lexer import PRICE_KINDS
 
 class ParserHolisticLife(ParserBase):
 
-    def parse(self, page_text: str, page_meta: dict) -> list:
-        lines = [self.clean_line(l) for l in page_text.splitlines() if l.strip()]
+    VERSION = 1
+
+    def parse(self, page_text, page_meta: dict) -> list:
+        page = self.prepare(page_text)
         products = []
 
         buffer = {"name": "", "description": ""}
 
-        for ln in lines:
+        for i, ln in enumerate(page.lines):
             # Precio aproximado
-            m = RE_PRICE.search(ln)
+            m = page.first(PRICE_KINDS, line=i)
             if m:
-                buffer["price"] = float(m.group(1).replace(",", "."))
+                buffer["price"] = m.value
 
             # Heurística simple: línea larga = nombre
             if len(ln.split()) >= 3 and "ml" not in ln.lower():
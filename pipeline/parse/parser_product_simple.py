@@ -1,52 +1,65 @@
 # pipeline/parse/parser_product_simple.py
 
 import re
+import numpy as np
 from .parser_base import ParserBase
+from ..text.lexer import PRICE_KINDS
+from .layout_assoc import associate_layout, box_centers, nearest
 
-RE_SKU = re.compile(r"\(\s*(\d{3,7})\s*\)")
-RE_POINTS = re.compile(r"(\d+)\s*pts", re.I)
+# Solo para _is_mostly_price_or_points en modo layout (líneas sin tokens)
 RE_PRICE = re.compile(r"\$?\s*(\d{2,5}(?:[.,]\d{2})?)")
-RE_POINTS_PRICE_LINE = re.compile(
-    r"(\d+)\s*pts.*?\$?\s*(\d{2,5}(?:[.,]\d{2})?)",
-    re.I
-)
+
+# Alcance (en líneas) del contexto de cada SKU, hacia arriba y hacia abajo
+WINDOW_RADIUS = 4
 
 class ParserProductSimple(ParserBase):
     """
     Parser v2 para páginas clasificadas como PRODUCT_SIMPLE.
     Trabaja con ventanas locales alrededor de cada SKU para evitar mezclar productos.
+    mode="sweep" usa parse_sweep: una sola pasada, sin ventanas traslapadas
+    (para páginas densas, 30+ SKUs).
     """
 
-    def parse(self, page_text: str, page_meta: dict) -> list:
-        lines = [self.clean_line(l) for l in page_text.splitlines() if l.strip()]
+    VERSION = 1
+
+    def __init__(self, mode: str = "window"):
+        if mode not in ("window", "sweep"):
+            raise ValueError(f"mode desconocido: {mode}")
+        self.mode = mode
+
+    def cache_id(self) -> str:
+        # Cada modo da productos distintos para la misma página
+        return f"{type(self).__name__}[{self.mode}]"
+
+    def parse(self, page_text, page_meta: dict) -> list:
+        if self.mode == "sweep":
+            return self.parse_sweep(page_text, page_meta)
+
+        page = self.prepare(page_text)
+        lines = page.lines
         products = []
 
         if not lines:
             return products
 
-        # Índices donde encontramos SKUs
-        sku_indices = []
-        for idx, ln in enumerate(lines):
-            if RE_SKU.search(ln):
-                sku_indices.append(idx)
+        # Líneas donde encontramos SKUs (primer SKU de cada una)
+        sku_at = page.first_per_line("SKU")
 
         # Si no hay SKU, tratamos toda la página como un solo producto "suave"
-        if not sku_indices:
-            prod = self._parse_block_as_single_product(lines, page_meta)
+        if not sku_at:
+            prod = self._parse_block_as_single_product(page, page_meta)
             return [prod] if prod else []
 
         # Para cada SKU, analizamos una ventana local de contexto
-        for idx in sku_indices:
-            window_start = max(0, idx - 4)
-            window_end = min(len(lines), idx + 5)
-            block_lines = lines[window_start:window_end]
-
-            sku = RE_SKU.search(lines[idx]).group(1)
+        for idx, sku_tok in sku_at.items():
+            window_start = max(0, idx - WINDOW_RADIUS)
+            window_end = min(len(lines), idx + WINDOW_RADIUS + 1)
 
             product = self._parse_block_for_sku(
-                sku=sku,
-                block_lines=block_lines,
-                sku_line_index=idx - window_start,
+                sku=sku_tok.value,
+                page=page,
+                window=range(window_start, window_end),
+                sku_idx=idx,
                 page_meta=page_meta,
             )
             if product:
@@ -54,66 +67,232 @@ class ParserProductSimple(ParserBase):
 
         return products
 
+    def parse_sweep(self, page_text, page_meta: dict) -> list:
+        """
+        Barrido lineal: recorre las líneas una sola vez y cada línea se
+        asigna al SKU más cercano (empate → el SKU de abajo, porque el
+        nombre va arriba del código), hasta WINDOW_RADIUS líneas.
+        Por SKU, una pequeña máquina de estados:
+          ARRIBA → candidatas a nombre
+          SKU    → la propia línea del código
+          ABAJO  → descripción
+        y en todas se acumulan puntos/precio con la misma precedencia que
+        el modo ventana (par "pts ... $" primero, luego cada uno por separado).
+        Costo O(líneas) en vez de O(SKUs × ventana × pasadas); mismo esquema
+        de producto que parse().
+        """
+        page = self.prepare(page_text)
+        lines = page.lines
+        if not lines:
+            return []
+
+        sku_at = page.first_per_line("SKU")
+        if not sku_at:
+            prod = self._parse_block_as_single_product(page, page_meta)
+            return [prod] if prod else []
+
+        sku_lines = list(sku_at)
+        last = len(sku_lines) - 1
+        line_tokens = page.line_tokens
+        products = []
+
+        k = 0
+        sku_idx = sku_lines[0]
+        above, below = [], []
+        pair = points = price = None
+
+        for i, ln in enumerate(lines):
+            # Avanzar al siguiente SKU si está igual o más cerca
+            while k < last and sku_lines[k + 1] - i <= i - sku_idx:
+                self._sweep_emit(sku_at[sku_idx].value, above, below, pair, points, price,
+                                 page_meta, products)
+                k += 1
+                sku_idx = sku_lines[k]
+                above, below = [], []
+                pair = points = price = None
+
+            if i < sku_idx - WINDOW_RADIUS or i > sku_idx + WINDOW_RADIUS:
+                continue
+
+            toks = line_tokens[i]
+
+            # Precio / puntos en orden de línea, con la precedencia de la ventana:
+            # par "pts ... $" primero; si no, el primero de cada uno
+            if toks and pair is None:
+                line_points = None
+                has_dollar = "$" in ln
+                for tok in toks:
+                    kind = tok.kind
+                    if kind == "POINTS":
+                        if line_points is None:
+                            line_points = tok.value
+                        if points is None:
+                            points = tok.value
+                    elif kind in PRICE_KINDS:
+                        if line_points is not None:
+                            pair = (line_points, tok.value)
+                            break
+                        if price is None and has_dollar:
+                            # solo el primer precio de la línea cuenta
+                            if tok.value >= 20:
+                                price = tok.value
+                            has_dollar = False
+
+            if i < sku_idx:
+                above.append(ln)
+            elif i > sku_idx and not self._is_mostly_price_or_points(ln, bool(toks)):
+                below.append(ln)
+
+        self._sweep_emit(sku_at[sku_idx].value, above, below, pair, points, price,
+                         page_meta, products)
+        return products
+
+    def _sweep_emit(self, sku: str, above: list, below: list, pair, points, price,
+                    page_meta: dict, products: list):
+        """Cierra el SKU actual del barrido y agrega su producto (si no es ruido)."""
+        if pair:
+            points, price = pair
+
+        # Nombre: la línea tipo título más cercana arriba; si no, la anterior
+        name = next((ln for ln in reversed(above) if self._looks_like_title(ln)), None)
+        if not name and above:
+            name = above[-1]
+
+        if not name and price is None:
+            return
+
+        products.append({
+            "sku": sku,
+            "name": name,
+            "description": " ".join(below).strip() if below else None,
+            "price": price,
+            "points": points,
+            "variants": [],
+            "combo_items": [],
+            "source_page": page_meta["page"],
+            "detected_type": "PRODUCT_SIMPLE",
+        })
+
+    def parse_layout(self, layout, page_meta: dict) -> list:
+        """
+        Variante con layout (PageLayout de layout_extractor): precio y puntos
+        se asignan por cercanía geométrica a cada SKU en una sola pasada,
+        en lugar de ventanas de líneas que mezclan columnas.
+        """
+        texts, boxes, _sizes = layout.lines()
+        assoc = associate_layout(texts, boxes)
+
+        # Sin SKUs no hay nada que asociar: mismo fallback que el modo texto
+        if not assoc:
+            return self.parse("\n".join(texts), page_meta)
+
+        centers = box_centers(boxes)
+        # Líneas con SKU, sin repetir: dos SKUs en la misma línea comparten
+        # caja y deben compartir también sus líneas de nombre / descripción
+        sku_lines = list(dict.fromkeys(a["line"] for a in assoc))
+        sku_set = set(sku_lines)
+
+        # Cada línea restante pertenece a la línea de SKU más cercana
+        other = [i for i in range(len(texts)) if i not in sku_set]
+        owner, _dist = nearest(centers[other], centers[sku_lines])
+        owner_line = np.asarray(sku_lines, dtype=np.int64)[owner] if len(other) else owner
+
+        products = []
+        for a in assoc:
+            sku_y = centers[a["line"], 1]
+            mine = [other[j] for j in np.flatnonzero(owner_line == a["line"])]
+
+            above = sorted((i for i in mine if centers[i, 1] < sku_y),
+                           key=lambda i: centers[i, 1], reverse=True)
+            below = sorted((i for i in mine if centers[i, 1] > sku_y),
+                           key=lambda i: centers[i, 1])
+
+            # Nombre: la línea tipo título más cercana arriba del SKU
+            name = next((texts[i] for i in above if self._looks_like_title(texts[i])), None)
+            if not name and above:
+                name = texts[above[0]]
+
+            description_parts = [
+                texts[i] for i in below if not self._is_mostly_price_or_points(texts[i])
+            ]
+            description = " ".join(description_parts).strip() if description_parts else None
+
+            if not name and a["price"] is None:
+                continue
+
+            products.append({
+                "sku": a["sku"],
+                "name": name,
+                "description": description,
+                "price": a["price"],
+                "points": a["points"],
+                "variants": [],
+                "combo_items": [],
+                "source_page": page_meta["page"],
+                "detected_type": "PRODUCT_SIMPLE",
+            })
+
+        return products
+
     # ----------------- helpers -----------------
 
     def _parse_block_for_sku(
         self,
         sku: str,
-        block_lines: list,
-        sku_line_index: int,
+        page,
+        window: range,
+        sku_idx: int,
         page_meta: dict,
     ) -> dict | None:
         """
-        block_lines: ventana alrededor del SKU
-        sku_line_index: índice del SKU dentro de block_lines
+        window: índices de línea (en page.lines) alrededor del SKU
+        sku_idx: índice de la línea del SKU
         """
+        lines = page.lines
         name = None
         description_parts = []
         price = None
         points = None
 
         # 1) Precio + puntos: primero intentamos en una sola línea
-        for ln in block_lines:
-            m = RE_POINTS_PRICE_LINE.search(ln)
-            if m:
-                points = int(m.group(1))
-                price = float(m.group(2).replace(",", "."))
+        # (tokens POINTS seguido de PRICE)
+        for i in window:
+            pair = self._points_then_price(page.line_tokens[i])
+            if pair:
+                points, price = pair
                 break
 
         # Si no encontramos, buscamos por separado
         if price is None or points is None:
-            for ln in block_lines:
+            for i in window:
                 if points is None:
-                    p = RE_POINTS.search(ln)
+                    p = page.first("POINTS", line=i)
                     if p:
-                        points = int(p.group(1))
+                        points = p.value
 
-                if price is None and "$" in ln:
-                    pr = RE_PRICE.search(ln)
-                    if pr:
-                        price_val = float(pr.group(1).replace(",", "."))
-                        # Filtrar números absurdamente bajos
-                        if price_val >= 20:
-                            price = price_val
+                if price is None and "$" in lines[i]:
+                    pr = page.first(PRICE_KINDS, line=i)
+                    # Filtrar números absurdamente bajos
+                    if pr and pr.value >= 20:
+                        price = pr.value
 
         # 2) Nombre: líneas inmediatamente arriba del SKU
         # Buscamos la primera línea "limpia" antes del SKU
-        for i in range(sku_line_index - 1, -1, -1):
-            cand = block_lines[i]
+        for i in range(sku_idx - 1, window.start - 1, -1):
+            cand = lines[i]
             if self._looks_like_title(cand):
                 name = cand
                 break
 
         # Si aún no hay nombre, tomar la línea anterior sin símbolos obvios
-        if not name and sku_line_index > 0:
-            name = block_lines[sku_line_index - 1]
+        if not name and sku_idx > window.start:
+            name = lines[sku_idx - 1]
 
         # 3) Descripción: líneas después del SKU que no sean puro precio/pts
-        for i in range(sku_line_index + 1, len(block_lines)):
-            ln = block_lines[i]
-            if self._is_mostly_price_or_points(ln):
+        for i in range(sku_idx + 1, window.stop):
+            if self._is_mostly_price_or_points(lines[i], bool(page.line_tokens[i])):
                 continue
-            description_parts.append(ln)
+            description_parts.append(lines[i])
 
         description = " ".join(description_parts).strip() if description_parts else None
 
@@ -135,26 +314,25 @@ class ParserProductSimple(ParserBase):
 
         return product
 
-    def _parse_block_as_single_product(self, lines: list, page_meta: dict) -> dict | None:
+    def _parse_block_as_single_product(self, page, page_meta: dict) -> dict | None:
         """
         Fallback para páginas sin SKU: un solo producto estimado.
         """
+        lines = page.lines
         price = None
         points = None
         name = None
         description_parts = []
 
-        for ln in lines:
+        for i, ln in enumerate(lines):
             if points is None:
-                pts = RE_POINTS.search(ln)
+                pts = page.first("POINTS", line=i)
                 if pts:
-                    points = int(pts.group(1))
+                    points = pts.value
             if price is None and "$" in ln:
-                pr = RE_PRICE.search(ln)
-                if pr:
-                    val = float(pr.group(1).replace(",", "."))
-                    if val >= 20:
-                        price = val
+                pr = page.first(PRICE_KINDS, line=i)
+                if pr and pr.value >= 20:
+                    price = pr.value
 
         # Nombre: primera línea que parece título
         for ln in lines:
@@ -163,10 +341,10 @@ class ParserProductSimple(ParserBase):
                 break
 
         # Descripción: resto de líneas sin precio/pts
-        for ln in lines:
+        for i, ln in enumerate(lines):
             if ln == name:
                 continue
-            if self._is_mostly_price_or_points(ln):
+            if self._is_mostly_price_or_points(ln, bool(page.line_tokens[i])):
                 continue
             description_parts.append(ln)
 
@@ -187,6 +365,16 @@ class ParserProductSimple(ParserBase):
             "detected_type": "PRODUCT_SIMPLE",
         }
 
+    def _points_then_price(self, line_tokens: list) -> tuple | None:
+        """(puntos, precio) si en la línea hay un POINTS seguido de un precio."""
+        points = None
+        for tok in line_tokens:
+            if tok.kind == "POINTS" and points is None:
+                points = tok.value
+            elif tok.kind in PRICE_KINDS and points is not None:
+                return points, tok.value
+        return None
+
     def _looks_like_title(self, line: str) -> bool:
         # Evitar líneas claramente de precio / pts / descuentos
         if any(k in line.lower() for k in ["pts", "$", "%", "descuento", "oferta", "cualquiera por"]):
@@ -199,10 +387,11 @@ class ParserProductSimple(ParserBase):
         alpha_chars = sum(ch.isalpha() for ch in line)
         return alpha_chars / max(len(line), 1) > 0.5
 
-    def _is_mostly_price_or_points(self, line: str) -> bool:
+    def _is_mostly_price_or_points(self, line: str, has_number: bool | None = None) -> bool:
+        """has_number: si la línea ya tiene tokens numéricos del lexer."""
         ln = line.lower()
         if "pts" in ln or "$" in ln or "%" in ln:
             return True
-        if RE_PRICE.search(line):
-            return True
-        return False
+        if has_number is None:
+            has_number = RE_PRICE.search(line) is not None
+        return has_number
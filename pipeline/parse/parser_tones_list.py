@@ -1,11 +1,7 @@
 # pipeline/parse/parser_tones_list.py
 
-import re
 from .parser_base import ParserBase
-
-RE_SKU = re.compile(r"\(\s*(\d{3,7})\s*\)")
-RE_POINTS = re.compile(r"(\d+)\s*pts", re.I)
-RE_PRICE = re.compile(r"\$?\s*(\d{2,5}(?:[.,]\d{2})?)")
+from ..text.lexer import PRICE_KINDS
 
 class ParserTonesList(ParserBase):
     """
@@ -14,27 +10,26 @@ class ParserTonesList(ParserBase):
     - Cada SKU se convierte en un "tono" con nombre propio.
     """
 
-    def parse(self, page_text: str, page_meta: dict) -> list:
-        lines = [self.clean_line(l) for l in page_text.splitlines() if l.strip()]
+    VERSION = 1
+
+    def parse(self, page_text, page_meta: dict) -> list:
+        page = self.prepare(page_text)
+        lines = page.lines
         products = []
 
         if not lines:
             return products
 
-        # Índices de líneas con SKU
-        sku_indices = [i for i, ln in enumerate(lines) if RE_SKU.search(ln)]
-        if not sku_indices:
+        # Líneas con SKU (primer SKU de cada una)
+        sku_at = page.first_per_line("SKU")
+        if not sku_at:
             return products
 
-        first_sku_idx = sku_indices[0]
-        header_lines = lines[:first_sku_idx]
-
-        price_general, points_general = self._extract_header_price_points(header_lines)
+        first_sku_idx = next(iter(sku_at))
+        price_general, points_general = self._extract_header_price_points(page, first_sku_idx)
 
-        for idx in sku_indices:
-            sku_line = lines[idx]
-            m = RE_SKU.search(sku_line)
-            sku = m.group(1)
+        for idx, sku_tok in sku_at.items():
+            sku = sku_tok.value
 
             tone_name = self._infer_tone_name(lines, idx)
             products.append({
@@ -51,39 +46,24 @@ class ParserTonesList(ParserBase):
 
     # ---------------- helpers ----------------
 
-    def _extract_header_price_points(self, header_lines: list) -> tuple[float | None, int | None]:
+    def _extract_header_price_points(self, page, header_end: int) -> tuple[float | None, int | None]:
         """
-        Extrae precio y puntos del encabezado:
-        - Ignora números dentro de paréntesis (SKUs).
-        - Prefiere números con símbolo $.
+        Extrae precio y puntos del encabezado (líneas antes del primer SKU):
+        - Los SKUs, puntos y % son tokens aparte: no se confunden con precio.
         - Filtra precios demasiado pequeños (2, 5, 10).
+        - Si hay varios, se queda con el último.
         """
-        text = "\n".join(header_lines)
-        # Quitar SKUs tipo (123456)
-        text_no_sku = RE_SKU.sub("", text)
-
         price_candidates = []
         points = None
 
-        for ln in text_no_sku.splitlines():
-            # puntos
-            if points is None:
-                p = RE_POINTS.search(ln)
-                if p:
-                    points = int(p.group(1))
-
-            # precios
-            for m in RE_PRICE.finditer(ln):
-                raw = m.group(1)
-                # saltar cosas muy cortas tipo 2, 5, 10
-                try:
-                    val = float(raw.replace(",", "."))
-                except ValueError:
-                    continue
-                if val < 20:
-                    continue
-                # si hay símbolo $, darle peso extra (pero aquí solo los apilamos)
-                price_candidates.append(val)
+        for tok in page.tokens:
+            if tok.line >= header_end:
+                break
+            if tok.kind == "POINTS":
+                if points is None:
+                    points = tok.value
+            elif tok.kind in PRICE_KINDS and tok.value >= 20:
+                price_candidates.append(tok.value)
 
         price = price_candidates[-1] if price_candidates else None
         return price, points
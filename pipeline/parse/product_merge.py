@@ -0,0 +1,148 @@
+# pipeline/parse/product_merge.py
+
+from .product_table import ProductTable
+
+# -------------------------------------------------------------
+# Prioridad por tipo de página (menor = gana). Una página DE_TO_A trae el
+# precio con descuento explícito; PRODUCT_SIMPLE el precio y puntos del
+# producto; TONES_LIST solo el precio general del encabezado.
+# -------------------------------------------------------------
+TYPE_PRIORITY = {
+    "DE_TO_A": 0,
+    "PRODUCT_SIMPLE": 1,
+    "TONES_LIST": 2,
+    "COMBO": 3,
+    "HOLISTIC": 4,
+}
+_LAST = len(TYPE_PRIORITY)
+
+# Regla por campo:
+# - "priority": el valor no vacío de la página con mejor TYPE_PRIORITY
+#   (empate: el primero visto)
+# - "longest": el texto más largo
+# - "union": listas unidas sin repetir, en orden de aparición
+# - "min": el menor (primera página)
+# - "first": el primer valor no vacío
+FIELD_RULES = {
+    "price": "priority",
+    "price_before": "priority",
+    "discount_percent": "priority",
+    "points": "priority",
+    "detected_type": "priority",
+    "name": "longest",
+    "description": "longest",
+    "variants": "union",
+    "combo_items": "union",
+    "source_pages": "union",
+    "sources": "union",
+    "source_page": "min",   # solo dentro de un PDF (sin sources)
+}
+
+
+class ProductMerger:
+    """
+    Índice por SKU que consolida los registros parciales de un mismo
+    producto (página principal + lista de tonos, varios PDFs) en uno solo,
+    campo por campo según FIELD_RULES. O(n): un acceso al dict por
+    registro y trabajo constante por campo.
+    Los productos sin SKU (combos, bloques sin código) pasan tal cual.
+    Cada producto de salida lleva todas sus apariciones: source_pages
+    dentro de un PDF, o sources ["archivo.pdf#página", ...] si se indica
+    el PDF (consolidado entre catálogos; ahí no lleva source_page).
+    """
+
+    __slots__ = ("index", "ranks", "seen", "order")
+
+    def __init__(self):
+        self.index = {}   # sku → producto consolidado
+        self.ranks = {}   # sku → {campo: prioridad del valor actual}
+        self.seen = {}    # (sku, campo) → valores ya unidos (reglas "union")
+        self.order = []   # productos en orden de primera aparición
+
+    def __len__(self) -> int:
+        return len(self.order)
+
+    def add(self, product: dict, pdf: str | None = None):
+        product = dict(product)
+        if "source_pages" not in product and "sources" not in product:
+            page = product.get("source_page")
+            product["source_pages"] = [page] if page is not None else []
+        if pdf is not None and "sources" not in product:
+            # Páginas de distintos PDFs no se pueden mezclar sin el archivo
+            product["sources"] = [f"{pdf}#{page}" for page in product.pop("source_pages")]
+        if "sources" in product:
+            # Entre PDFs el número de página solo tiene sentido junto a su
+            # archivo: sources ya lo trae
+            product.pop("source_page", None)
+
+        sku = product.get("sku")
+        if not sku:
+            self.order.append(product)
+            return
+
+        current = self.index.get(sku)
+        rank = TYPE_PRIORITY.get(product.get("detected_type"), _LAST)
+
+        if current is None:
+            # Copia de las listas: se extienden al consolidar
+            for field, rule in FIELD_RULES.items():
+                if rule == "union" and product.get(field) is not None:
+                    product[field] = list(product[field])
+                    self.seen[sku, field] = set(product[field])
+            self.index[sku] = product
+            self.ranks[sku] = {
+                field: rank for field, rule in FIELD_RULES.items()
+                if rule == "priority" and product.get(field) is not None
+            }
+            self.order.append(product)
+            return
+
+        ranks = self.ranks[sku]
+        for field, value in product.items():
+            if value is None:
+                continue
+            rule = FIELD_RULES.get(field, "first")
+            old = current.get(field)
+
+            if rule == "priority":
+                if old is None or rank < ranks.get(field, _LAST):
+                    current[field] = value
+                    ranks[field] = rank
+            elif rule == "longest":
+                if not old or len(value) > len(old):
+                    current[field] = value
+            elif rule == "union":
+                seen = self.seen.get((sku, field))
+                if seen is None:
+                    seen = self.seen[sku, field] = set(old or ())
+                if old is None:
+                    old = current[field] = []
+                for v in value:
+                    if v not in seen:
+                        seen.add(v)
+                        old.append(v)
+            elif rule == "min":
+                if old is None or value < old:
+                    current[field] = value
+            elif old is None:
+                current[field] = value
+
+    def extend(self, products, pdf: str | None = None):
+        for product in products:
+            self.add(product, pdf)
+
+    def products(self) -> list:
+        """Un producto por SKU (más los sin SKU), en orden de primera aparición."""
+        return list(self.order)
+
+    def to_table(self) -> ProductTable:
+        table = ProductTable()
+        table.extend(self.order)
+        return table
+
+
+def merge_products(products, pdf: str | None = None) -> list:
+    """Atajo: consolida una lista de productos en uno por SKU."""
+    merger = ProductMerger()
+    merger.extend(products, pdf)
+    return merger.products()
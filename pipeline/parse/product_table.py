@@ -0,0 +1,307 @@
+# pipeline/parse/product_table.py
+
+import json
+import math
+from array import array
+from pathlib import Path
+
+# -------------------------------------------------------------
+# Campos conocidos de un producto, en el orden de exportación.
+# Parsers: sku ... detected_type (ver ParserBase.parse)
+# Scrapers: price_purchase, price_sale*, image_url, cycle
+# -------------------------------------------------------------
+FIELDS = (
+    "sku", "name", "description",
+    "price", "price_before", "discount_percent", "points",
+    "variants", "combo_items",
+    "brand", "category",
+    "source_page", "source_pages", "sources", "detected_type",
+    "price_purchase", "price_sale",
+    "price_sale_regular", "price_sale_promo", "price_sale_final",
+    "image_url", "cycle",
+)
+
+# Columnas numéricas: float64 con NaN como None / int64 con centinela.
+# Un valor de otro tipo (precio int, puntos float) o fuera de rango se
+# guarda aparte tal cual, para que la fila salga idéntica.
+FLOAT_FIELDS = (
+    "price", "price_before",
+    "price_purchase", "price_sale",
+    "price_sale_regular", "price_sale_promo", "price_sale_final",
+)
+INT_FIELDS = ("discount_percent", "points", "source_page")
+# Texto repetido entre páginas y ciclos: una sola copia por valor (interning)
+STR_FIELDS = ("sku", "name", "brand", "category", "detected_type", "cycle")
+# Texto casi siempre único: lista simple
+TEXT_FIELDS = ("description", "image_url")
+# Listas (variants, combo_items, páginas del merge): tuplas; la vacía es compartida
+LIST_FIELDS = ("variants", "combo_items", "source_pages", "sources")
+
+_INT_NONE = -(2 ** 63)
+_BIT = {name: 1 << i for i, name in enumerate(FIELDS)}
+_UNSET = object()
+
+
+class ProductRecord:
+    """
+    Producto con __slots__ en lugar de dict (parsers y scrapers).
+    Solo los campos asignados existen: to_dict() reproduce el dict original
+    (campos en el orden de FIELDS); claves fuera de FIELDS van a `extra`.
+    """
+
+    __slots__ = FIELDS + ("extra",)
+
+    def __init__(self, **fields):
+        extra = None
+        for name, value in fields.items():
+            if name in _BIT:
+                setattr(self, name, value)
+            else:
+                if extra is None:
+                    extra = {}
+                extra[name] = value
+        self.extra = extra
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ProductRecord":
+        return cls(**data)
+
+    def get(self, name: str, default=None):
+        value = getattr(self, name, _UNSET)
+        if value is _UNSET:
+            return self.extra.get(name, default) if self.extra else default
+        return value
+
+    def to_dict(self) -> dict:
+        out = {}
+        for name in FIELDS:
+            value = getattr(self, name, _UNSET)
+            if value is not _UNSET:
+                out[name] = value
+        if self.extra:
+            out.update(self.extra)
+        return out
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, ProductRecord):
+            return NotImplemented
+        return self.to_dict() == other.to_dict()
+
+    def __repr__(self) -> str:
+        return f"ProductRecord({self.to_dict()!r})"
+
+
+class ProductTable:
+    """
+    Productos de uno o varios catálogos en columnas:
+    - precios en array("d"), puntos / % / página en array("q")
+    - sku, nombre, marca, categoría, tipo y ciclo internados (una copia
+      por valor en toda la tabla)
+    - por fila, una máscara de bits con los campos presentes, así la
+      exportación da los mismos dicts que se agregaron (llaves en el
+      orden de FIELDS)
+    Con 50k productos de PRODUCT_SIMPLE: ~0.3 KB por fila contra ~0.65 KB
+    de la lista de dicts (texto incluido).
+    """
+
+    def __init__(self):
+        self._present = array("L")
+        self._floats = {name: array("d") for name in FLOAT_FIELDS}
+        self._ints = {name: array("q") for name in INT_FIELDS}
+        self._objects = {name: [] for name in STR_FIELDS + TEXT_FIELDS + LIST_FIELDS}
+        self._extra = {}  # fila → claves fuera de FIELDS (raro)
+        self._boxed = {}  # (campo, fila) → valor que no cabe en su columna (raro)
+        self._strings = {}
+
+    def __len__(self) -> int:
+        return len(self._present)
+
+    def _intern(self, value):
+        if value is None:
+            return None
+        return self._strings.setdefault(value, value)
+
+    # ---------------- escritura ----------------
+
+    def append(self, product) -> None:
+        """Agrega un producto (dict o ProductRecord)."""
+        if isinstance(product, ProductRecord):
+            product = product.to_dict()
+
+        mask = 0
+        for name, value in product.items():
+            bit = _BIT.get(name)
+            if bit is None:
+                self._extra.setdefault(len(self._present), {})[name] = value
+            else:
+                mask |= bit
+
+        row = len(self._present)
+        get = product.get
+        for name, col in self._floats.items():
+            value = get(name)
+            if value is None:
+                col.append(math.nan)
+            elif type(value) is float and not math.isnan(value):
+                col.append(value)
+            else:
+                self._boxed[name, row] = value
+                col.append(math.nan)
+        for name, col in self._ints.items():
+            value = get(name)
+            if value is None:
+                col.append(_INT_NONE)
+            elif type(value) is int and _INT_NONE < value < 2 ** 63:
+                col.append(value)
+            else:
+                self._boxed[name, row] = value
+                col.append(_INT_NONE)
+        objects = self._objects
+        for name in STR_FIELDS:
+            objects[name].append(self._intern(get(name)))
+        for name in TEXT_FIELDS:
+            objects[name].append(get(name))
+        for name in LIST_FIELDS:
+            value = get(name)
+            objects[name].append(tuple(value) if value else (() if value is not None else None))
+
+        self._present.append(mask)
+
+    def extend(self, products) -> None:
+        for product in products:
+            self.append(product)
+
+    def reorder(self, order) -> None:
+        """
+        Reacomoda las filas en el lugar: la fila i pasa a ser la order[i]
+        anterior (order es una permutación de range(len(self))). Columna
+        por columna, sin pasar por dicts.
+        """
+        order = list(order)
+        self._present = array("L", [self._present[i] for i in order])
+        for cols, typecode in ((self._floats, "d"), (self._ints, "q")):
+            for name, col in cols.items():
+                cols[name] = array(typecode, [col[i] for i in order])
+        for name, col in self._objects.items():
+            self._objects[name] = [col[i] for i in order]
+
+        if self._extra or self._boxed:
+            new_row = {old: new for new, old in enumerate(order)}
+            self._extra = {new_row[i]: v for i, v in self._extra.items()}
+            self._boxed = {(name, new_row[i]): v for (name, i), v in self._boxed.items()}
+
+    # ---------------- lectura ----------------
+
+    def _value(self, name: str, i: int):
+        if name in self._floats:
+            value = self._floats[name][i]
+            if math.isnan(value):
+                return self._boxed.get((name, i))
+            return value
+        if name in self._ints:
+            value = self._ints[name][i]
+            if value == _INT_NONE:
+                return self._boxed.get((name, i))
+            return value
+        value = self._objects[name][i]
+        if name in LIST_FIELDS and value is not None:
+            return list(value)
+        return value
+
+    def row(self, i: int) -> dict:
+        """La fila i como dict (mismas llaves que el producto agregado)."""
+        mask = self._present[i]
+        out = {name: self._value(name, i) for name in FIELDS if mask & _BIT[name]}
+        extra = self._extra.get(i)
+        if extra:
+            out.update(extra)
+        return out
+
+    def __getitem__(self, i: int) -> ProductRecord:
+        if i < 0:
+            i += len(self)
+        return ProductRecord(**self.row(i))
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield ProductRecord(**self.row(i))
+
+    def rows(self):
+        """Genera las filas como dicts, una a la vez."""
+        for i in range(len(self)):
+            yield self.row(i)
+
+    def column(self, name: str) -> list:
+        """Valores de un campo en todas las filas (None donde falta)."""
+        return [self._value(name, i) for i in range(len(self))]
+
+    # ---------------- JSON ----------------
+
+    def dump_json(self, fp, indent: int = 2) -> None:
+        """
+        Escribe la tabla como lista JSON, fila por fila (sin armar la lista
+        de dicts completa). Mismo texto que json.dump(rows, indent=indent,
+        ensure_ascii=False).
+        """
+        if not len(self):
+            fp.write("[]")
+            return
+
+        pad = " " * indent
+        fp.write("[\n")
+        for i in range(len(self)):
+            if i:
+                fp.write(",\n")
+            item = json.dumps(self.row(i), indent=indent, ensure_ascii=False)
+            fp.write(pad + item.replace("\n", "\n" + pad))
+        fp.write("\n]")
+
+    def write_json(self, path, indent: int = 2) -> Path:
+        path = Path(path)
+        with open(path, "w", encoding="utf-8") as f:
+            self.dump_json(f, indent=indent)
+        return path
+
+    @classmethod
+    def read_json(cls, path, chunk_size: int = 1 << 20) -> "ProductTable":
+        """
+        Carga una lista JSON de productos (salida de parsers o scrapers)
+        elemento por elemento, leyendo el archivo en bloques de chunk_size:
+        en memoria solo están el bloque actual y la tabla, nunca el archivo
+        completo ni la lista de dicts.
+        """
+        decoder = json.JSONDecoder()
+        table = cls()
+
+        with open(path, encoding="utf-8") as f:
+            buf, pos = "", 0
+            started = eof = False
+            while True:
+                while pos < len(buf) and buf[pos] in " \t\r\n,":
+                    pos += 1
+
+                if pos < len(buf):
+                    if not started:
+                        if buf[pos] != "[":
+                            raise ValueError(f"{path}: se esperaba una lista JSON")
+                        started = True
+                        pos += 1
+                        continue
+                    if buf[pos] == "]":
+                        return table
+                    try:
+                        product, pos = decoder.raw_decode(buf, pos)
+                    except json.JSONDecodeError:
+                        if eof:
+                            raise
+                        # Elemento cortado por el fin del bloque: leer más
+                    else:
+                        table.append(product)
+                        continue
+
+                if eof:
+                    raise ValueError(f"{path}: lista JSON incompleta")
+                chunk = f.read(chunk_size)
+                eof = not chunk
+                buf = buf[pos:] + chunk
+                pos = 0
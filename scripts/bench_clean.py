@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+scripts/bench_clean.py
+
+Compara la cadena original normalize_text + clean_text_block contra el
+motor compilado clean_text_fast:
+ - Verifica que la salida sea idéntica (páginas sintéticas + casos aleatorios).
+ - Mide el tiempo por página de cada uno.
+
+Uso:
+    python scripts/bench_clean.py [--pages 2000] [--fuzz 50000]
+"""
+
+import sys
+import time
+import random
+import argparse
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT))
+
+from pipeline.clean.normalizer import normalize_text
+from pipeline.clean.cleaner import clean_text_block
+from pipeline.clean.fast_cleaner import clean_text_fast
+
+FUZZ_ALPHABET = list(" \t\n\r\xa0•●■□▪▫►◄◆◇|-_$%Pág.5aAÁá0") + ["Pág", "PÁG", "||", "---", "__", "é"]
+
+
+def synthetic_page(rng: random.Random, products: int = 12) -> str:
+    """Página típica de PyMuPDF: una línea por span, espacios simples."""
+    parts = []
+    for i in range(products):
+        sku = rng.randint(10000, 999999)
+        parts.append(f"Crema Corporal Tododia {i}\n")
+        parts.append(f"Hidratación 72 h para piel seca ({sku})\n")
+        parts.append(f"{rng.randint(5, 60)} pts $ {rng.randint(99, 999)}.00\n")
+        parts.append(f"De: $ {rng.randint(300, 900)} A: $ {rng.randint(99, 299)} {rng.randint(10, 50)} %\n")
+    parts.append("Válido hasta agotar existencias\n")
+    return "".join(parts)
+
+
+def noisy_page(rng: random.Random, products: int = 12) -> str:
+    """Página con todo el ruido posible: viñetas, separadores, tabs, 'Pág. N'."""
+    parts = []
+    for i in range(products):
+        sku = rng.randint(10000, 999999)
+        parts.append(f"•  Crema   Corporal\tTododia {i}\n")
+        parts.append(f"Hidratación  72 h  para piel seca ({sku})\n")
+        parts.append(f"{rng.randint(5, 60)} pts   \t $ {rng.randint(99, 999)}.00\n")
+        parts.append(f"De: $ {rng.randint(300, 900)}  A: $ {rng.randint(99, 299)}  {rng.randint(10, 50)} %\n")
+        if i % 4 == 0:
+            parts.append("\n\n\n------------ || ||  ____\n\n\n")
+    parts.append(f"Pág. {rng.randint(1, 200)}   Válido hasta agotar existencias\n")
+    return "".join(parts)
+
+
+def original_chain(text: str) -> str:
+    return clean_text_block(normalize_text(text))
+
+
+def bench(fn, pages, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for p in pages:
+            fn(p)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pages", type=int, default=2000)
+    parser.add_argument("--fuzz", type=int, default=50000)
+    args = parser.parse_args()
+
+    rng = random.Random(2025)
+    page_sets = {
+        "típicas": [synthetic_page(rng) for _ in range(args.pages)],
+        "ruidosas": [noisy_page(rng) for _ in range(args.pages)],
+    }
+
+    # 1) Equivalencia exacta
+    for pages in page_sets.values():
+        for p in pages:
+            assert original_chain(p) == clean_text_fast(p)
+    for _ in range(args.fuzz):
+        s = "".join(rng.choice(FUZZ_ALPHABET) for _ in range(rng.randint(0, 40)))
+        if original_chain(s) != clean_text_fast(s):
+            raise AssertionError(f"Salida distinta para {s!r}")
+    print(f"✔ Salida idéntica en {2 * args.pages} páginas y {args.fuzz} casos aleatorios")
+
+    # 2) Tiempos
+    per_page = 1e6 / args.pages
+    print(f"\n{'páginas':<10} {'original µs':>12} {'rápido µs':>10} {'speedup':>8}")
+    for name, pages in page_sets.items():
+        t_orig = bench(original_chain, pages)
+        t_fast = bench(clean_text_fast, pages)
+        print(f"{name:<10} {t_orig * per_page:>12.1f} {t_fast * per_page:>10.1f} {t_orig / t_fast:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
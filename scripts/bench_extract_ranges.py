@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+scripts/bench_extract_ranges.py
+
+Benchmark de extracción intra-documento por rangos de páginas.
+Genera un PDF sintético grande (texto tipo catálogo) y mide
+extract_text_from_pdf con 1..N workers.
+
+Uso:
+    python scripts/bench_extract_ranges.py [--pages 600] [--max-workers 8] [--ocr]
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT))
+
+import fitz  # PyMuPDF
+
+from pipeline.extract.text_extractor import extract_text_from_pdf
+from pipeline.extract.ocr_extractor import extract_text_ocr
+
+
+def build_synthetic_pdf(path: Path, pages: int, lines_per_page: int = 60):
+    """PDF de texto con líneas tipo producto/SKU/precio en cada página."""
+    doc = fitz.open()
+    for p in range(pages):
+        page = doc.new_page()
+        y = 40
+        for i in range(lines_per_page):
+            sku = 100000 + p * lines_per_page + i
+            page.insert_text((40, y), f"Crema corporal Tododia {i} ({sku})  {i % 50} pts  $ {199 + i}.00", fontsize=8)
+            y += 12
+    doc.save(str(path))
+    doc.close()
+
+
+def worker_steps(max_workers: int) -> list:
+    steps = []
+    w = 1
+    while w < max_workers:
+        steps.append(w)
+        w *= 2
+    steps.append(max_workers)
+    return steps
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pages", type=int, default=600)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--ocr", action="store_true", help="Medir la ruta OCR (requiere tesseract)")
+    args = parser.parse_args()
+
+    extract = extract_text_ocr if args.ocr else extract_text_from_pdf
+
+    with tempfile.TemporaryDirectory() as tmp:
+        pdf_path = Path(tmp) / "synthetic_catalog.pdf"
+        print(f"📄 Generando PDF sintético de {args.pages} páginas...")
+        build_synthetic_pdf(pdf_path, args.pages)
+
+        baseline = None
+        reference = None
+        print(f"\n{'workers':>8} {'segundos':>10} {'speedup':>8}")
+        for workers in worker_steps(args.max_workers):
+            t0 = time.perf_counter()
+            pages = extract(str(pdf_path), workers=workers)
+            elapsed = time.perf_counter() - t0
+
+            if reference is None:
+                reference = pages
+                baseline = elapsed
+            elif list(pages.items()) != list(reference.items()):
+                raise RuntimeError(f"La salida con {workers} workers no coincide con 1 worker")
+
+            print(f"{workers:>8} {elapsed:>10.3f} {baseline / elapsed:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+scripts/bench_parse_products.py
+
+Compara parse_products (máquina de estados por tabla) contra la cadena de
+ifs anterior, copiada abajo tal cual como referencia:
+ - Diferencial: misma salida (o la misma excepción) en bloques aleatorios
+   armados con líneas de catálogo reales y casos borde (pies de página,
+   "A: $" sin número, líneas vacías, códigos de 4 y 7 dígitos...).
+ - Tiempo por línea de ambas versiones.
+
+Uso:
+    python scripts/bench_parse_products.py [--blocks 20000] [--lines 40]
+"""
+
+import re
+import sys
+import time
+import random
+import argparse
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT))
+
+from pipeline.parse.parse_products import parse_products
+
+
+# ---------------- referencia (versión anterior) ----------------
+
+def ref_is_name(line):
+    tokens = line.lower()
+    if any(x in tokens for x in ["$", "pts", "(", "a:"]):
+        return False
+    return len(line.split()) >= 2
+
+
+def ref_is_description(line):
+    tokens = line.lower()
+    return (
+        len(line.split()) >= 3 and
+        not any(x in tokens for x in ["$", "pts", "(", "a:"])
+    )
+
+
+def ref_is_code(line):
+    return bool(re.search(r"\(\d{5,6}\)", line))
+
+
+def ref_is_price(line):
+    return "$" in line
+
+
+def ref_is_price_discount(line):
+    return "a:" in line.lower() and "$" in line
+
+
+def ref_is_footer(line):
+    tokens = line.lower()
+    return (
+        "válido hasta agotar existencias" in tokens or
+        "valido hasta agotar existencias" in tokens or
+        "cofepris" in tokens or
+        "salud es belleza" in tokens
+    )
+
+
+def ref_parse_products(blocks):
+    products = []
+
+    current = {
+        "nombre": [],
+        "descripcion": [],
+        "codigo": None,
+        "puntos": None,
+        "precio_normal": None,
+        "precio_descuento": None
+    }
+
+    state = "nombre"
+
+    for line in blocks:
+        line = line.strip()
+        if not line or ref_is_footer(line):
+            continue
+
+        if state == "nombre":
+            if ref_is_name(line):
+                current["nombre"].append(line)
+                continue
+            else:
+                state = "descripcion"
+
+        if state == "descripcion":
+            if ref_is_description(line):
+                current["descripcion"].append(line)
+                continue
+            else:
+                state = "codigo"
+
+        if state == "codigo":
+            if ref_is_code(line):
+                code_match = re.search(r"\((\d{5,6})\)", line)
+                if code_match:
+                    current["codigo"] = code_match.group(1)
+                pts_match = re.search(r"(\d+)\s*pts", line.lower())
+                if pts_match:
+                    current["puntos"] = int(pts_match.group(1))
+                state = "precios"
+                continue
+            else:
+                continue
+
+        if state == "precios":
+            if ref_is_price_discount(line):
+                current["precio_descuento"] = float(line.lower().split("$")[1])
+            elif ref_is_price(line):
+                current["precio_normal"] = float(line.split("$")[1])
+
+            if current["codigo"] and current["precio_descuento"] is not None:
+                current["nombre"] = " ".join(current["nombre"]).strip()
+                current["descripcion"] = " ".join(current["descripcion"]).strip()
+
+                products.append(current)
+
+                current = {
+                    "nombre": [],
+                    "descripcion": [],
+                    "codigo": None,
+                    "puntos": None,
+                    "precio_normal": None,
+                    "precio_descuento": None
+                }
+                state = "nombre"
+
+    return products
+
+
+# ---------------- datos ----------------
+
+LINES = [
+    "Crema Corporal Tododia", "Perfume Kaiak", "Ekos", "Hidratación 24 h para piel seca",
+    "(12345)", "(123456) 19 pts", "(1234)", "(1234567)", "( 12345 )", "13 PTS (54321)",
+    "$199.00", "$ 250", "A:$149.50", "A: $ 99", "a: $120", "A:$", "$12 pts", "De $300 A:$200",
+    "Válido hasta agotar existencias", "COFEPRIS 123", "Salud es belleza", "",
+    "   ", "Set (Kit) regalo", "30% de descuento", "Labial", "Una Mate Rojo Intenso",
+]
+
+
+def random_block(rng: random.Random, n: int) -> list:
+    return [rng.choice(LINES) + rng.choice(["", " ", "\n"]) for _ in range(n)]
+
+
+def catalog_block(rng: random.Random, products: int) -> list:
+    """Secuencia bien formada: nombre, descripción, código, precio, precio A:."""
+    block = []
+    for i in range(products):
+        block.append(f"Crema Corporal Tododia {i}")
+        block.append(f"Hidratación {rng.randint(24, 72)} h para piel seca")
+        block.append(f"({rng.randint(10000, 999999)}) {rng.randint(5, 60)} pts")
+        block.append(f"${rng.randint(100, 999)}.00")
+        block.append(f"A:${rng.randint(50, 99)}.50")
+    block.append("Válido hasta agotar existencias")
+    return block
+
+
+def run(fn, block):
+    try:
+        return fn(block)
+    except Exception as e:
+        return (type(e), str(e))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--blocks", type=int, default=20000)
+    parser.add_argument("--lines", type=int, default=40)
+    args = parser.parse_args()
+
+    rng = random.Random(2025)
+
+    # 1) Diferencial
+    blocks = [random_block(rng, rng.randint(0, args.lines)) for _ in range(args.blocks)]
+    blocks += [catalog_block(rng, rng.randint(1, 20)) for _ in range(args.blocks // 10)]
+    mismatches = sum(run(ref_parse_products, b) != run(parse_products, b) for b in blocks)
+    print(f"🔎 Diferencial: {len(blocks)} bloques, {mismatches} diferencias")
+    if mismatches:
+        sys.exit(1)
+
+    # 2) Tiempo (bloques bien formados: sin excepciones)
+    timed = [catalog_block(rng, 30) for _ in range(200)]
+    n_lines = sum(len(b) for b in timed)
+    for name, fn in (("ifs (anterior)", ref_parse_products), ("tabla", parse_products)):
+        best = float("inf")
+        for _ in range(5):
+            t0 = time.perf_counter()
+            for b in timed:
+                fn(b)
+            best = min(best, time.perf_counter() - t0)
+        print(f"⏱  {name:<15} {1e9 * best / n_lines:8.0f} ns/línea")
+
+
+if __name__ == "__main__":
+    main()
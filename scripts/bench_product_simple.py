@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+scripts/bench_product_simple.py
+
+Compara ParserProductSimple en modo ventana (parse) contra el barrido
+lineal (parse_sweep) en páginas PRODUCT_SIMPLE densas:
+ - Tiempo por página con 30, 60 y 120 SKUs (solo parser; el lexer se
+   comparte entre modos y se excluye).
+ - Coincidencia: % de productos idénticos entre ambos modos. Se espera
+   baja: la ventana traslapada toma precio/nombre del producto vecino
+   y mete el nombre del siguiente en la descripción; el barrido no.
+
+Uso:
+    python scripts/bench_product_simple.py [--pages 200] [--skus 30 60 120]
+"""
+
+import sys
+import time
+import random
+import argparse
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT))
+
+from pipeline.clean.prepared_page import PreparedPage
+from pipeline.parse.parser_product_simple import ParserProductSimple
+
+NAMES = ["Crema Corporal Tododia", "Perfume Kaiak Aventura", "Jabón Ekos Castaña",
+         "Desodorante Humor", "Aceite Trifásico Ekos", "Labial Una Mate"]
+
+
+def dense_page(rng: random.Random, skus: int) -> str:
+    """Página tipo retícula: nombre, descripción, código, pts/precio por producto."""
+    parts = []
+    for i in range(skus):
+        parts.append(f"{rng.choice(NAMES)} {i}\n")
+        if rng.random() < 0.6:
+            parts.append(f"Hidratación {rng.randint(24, 72)} h para piel seca\n")
+        parts.append(f"({rng.randint(10000, 999999)})\n")
+        if rng.random() < 0.7:
+            parts.append(f"{rng.randint(5, 60)} pts $ {rng.randint(99, 999)}.00\n")
+        else:
+            parts.append(f"$ {rng.randint(99, 999)}.00\n{rng.randint(5, 60)} pts\n")
+    parts.append("Válido hasta agotar existencias\n")
+    return "".join(parts)
+
+
+def bench(fn, pages, meta, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        # El lexer es trabajo compartido por página (PreparedPage): se hace
+        # fuera del cronómetro para medir solo el parser
+        prepared = [PreparedPage(p) for p in pages]
+        for p in prepared:
+            p.line_tokens
+        t0 = time.perf_counter()
+        for p in prepared:
+            fn(p, meta)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--skus", type=int, nargs="+", default=[30, 60, 120])
+    args = parser.parse_args()
+
+    rng = random.Random(2025)
+    window = ParserProductSimple(mode="window")
+    sweep = ParserProductSimple(mode="sweep")
+    meta = {"page": 1, "detected_type": "PRODUCT_SIMPLE"}
+
+    print(f"{'SKUs':>5} {'ventana µs':>11} {'barrido µs':>11} {'speedup':>8} {'iguales':>8}")
+    for n in args.skus:
+        pages = [dense_page(rng, n) for _ in range(args.pages)]
+
+        same = total = 0
+        for p in pages:
+            a, b = window.parse(p, meta), sweep.parse(p, meta)
+            total += max(len(a), len(b))
+            same += sum(x == y for x, y in zip(a, b))
+
+        per_page = 1e6 / args.pages
+        t_win = bench(window.parse, pages, meta)
+        t_sweep = bench(sweep.parse, pages, meta)
+        print(f"{n:>5} {t_win * per_page:>11.1f} {t_sweep * per_page:>11.1f} "
+              f"{t_win / t_sweep:>7.2f}x {100 * same / max(total, 1):>7.1f}%")
+
+
+if __name__ == "__main__":
+    main()
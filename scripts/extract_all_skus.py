@@ -1,12 +1,19 @@
 #!/usr/bin/env python3
 # scripts/extract_all_skus.py
 
+import sys
 import re
 import json
 import argparse
 from pathlib import Path
-from typing import List, Set, Dict
-import fitz  # PyMuPDF
+from typing import List, Set, Dict, Tuple
+from concurrent.futures import ProcessPoolExecutor
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT))
+
+from pipeline.extract.text_extractor import extract_text_cached
+from pipeline.parse.corpus_scan import PAGE_SEP, join_pages
 
 # --------------------------------------------------------
 # REGLAS DE EXTRACCIÓN
@@ -15,55 +22,51 @@ import fitz  # PyMuPDF
 # Natura / Avon Hogar → SKUs dentro de paréntesis (3–6 dígitos)
 RGX_PARENTESIS = re.compile(r"\((\d{3,6})\)")
 
-# Avon Belleza → token numérico entero de 5–6 dígitos (NO precios)
-RGX_AVON_TOKEN = re.compile(r"\b(\d{5,6})\b")
+# Avon Belleza → token numérico entero de 5–6 dígitos (NO precios):
+# ninguno de los 4 caracteres previos es "$", "." o ",". Las lookbehind no
+# cruzan PAGE_SEP, así el contexto izquierdo se corta en el inicio de la página.
+RGX_AVON_SKU = re.compile(
+    r"\b(?<![$.,])(?<![$.,][^\x00])(?<![$.,][^\x00]{2})(?<![$.,][^\x00]{3})(\d{5,6})\b"
+)
 
 
 def extract_skus_parentesis(pdf_path: Path) -> List[str]:
     """Extrae SKUs entre paréntesis para Natura y Avon Hogar."""
     print(f"📄 Leyendo PDF (paréntesis): {pdf_path.name}")
-    doc = fitz.open(pdf_path)
-    found: Set[str] = set()
 
-    for page in doc:
-        text = page.get_text("text")
-        for sku in RGX_PARENTESIS.findall(text):
-            found.add(sku)
+    # Un solo findall sobre todo el documento
+    text = join_pages(extract_text_cached(str(pdf_path)).values())
+    found: Set[str] = set(RGX_PARENTESIS.findall(text))
 
-    doc.close()
     return sorted(found, key=lambda x: int(x))
 
 
 def extract_skus_avon_belleza(pdf_path: Path) -> List[str]:
     """Extrae SKUs tipo Avon Belleza: 5–6 dígitos enteros, evitando precios."""
     print(f"📄 Leyendo PDF (Avon Belleza): {pdf_path.name}")
-    doc = fitz.open(pdf_path)
-    found: Set[str] = set()
-
-    for page in doc:
-        text = page.get_text("text")
-
-        for m in RGX_AVON_TOKEN.finditer(text):
-            sku = m.group(1)
 
-            # Evitar precios: "$10399", "10.399", "10,399"
-            start = m.start()
-            left = text[max(0, start - 4):start]
+    # Evitar precios: "$10399", "10.399", "10,399" (filtro dentro de RGX_AVON_SKU).
+    # Un PAGE_SEP dentro de una página cortaría su contexto: pasa a espacio,
+    # que para el patrón es igual (no es palabra ni "$.,").
+    pages = extract_text_cached(str(pdf_path))
+    text = join_pages(page.replace(PAGE_SEP, " ") for page in pages.values())
+    found: Set[str] = set(RGX_AVON_SKU.findall(text))
 
-            if "$" in left or "." in left or "," in left:
-                continue
+    return sorted(found, key=lambda x: int(x))
 
-            found.add(sku)
 
-    doc.close()
-    return sorted(found, key=lambda x: int(x))
+def extract_skus_for_pdf(pdf_path: Path) -> Tuple[str, List[str]]:
+    """Elige la regla según el catálogo. Retorna (nombre_pdf, skus)."""
+    if "belleza" in pdf_path.name.lower():
+        return pdf_path.name, extract_skus_avon_belleza(pdf_path)
+    return pdf_path.name, extract_skus_parentesis(pdf_path)
 
 
 # --------------------------------------------------------
 # MAIN
 # --------------------------------------------------------
 
-def main(ciclo: str):
+def main(ciclo: str, workers: int = 1):
     INPUT_DIR = Path("input_pdfs")
     OUTPUT_DIR = Path("output/skus")
     OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
@@ -86,15 +89,15 @@ def main(ciclo: str):
 
     all_skus: Set[str] = set()
 
-    for pdf in pdfs:
-        name = pdf.name.lower()
-
-        if "belleza" in name:
-            skus = extract_skus_avon_belleza(pdf)
-        else:
-            skus = extract_skus_parentesis(pdf)
+    # Un proceso por catálogo; map conserva el orden de `pdfs`
+    if workers > 1 and len(pdfs) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(pdfs))) as pool:
+            results = list(pool.map(extract_skus_for_pdf, pdfs))
+    else:
+        results = [extract_skus_for_pdf(pdf) for pdf in pdfs]
 
-        stats[pdf.name] = len(skus)
+    for pdf_name, skus in results:
+        stats[pdf_name] = len(skus)
         all_skus.update(skus)
 
     final = sorted(all_skus, key=lambda x: int(x))
@@ -120,5 +123,7 @@ def main(ciclo: str):
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
     parser.add_argument("--cycle", required=True, help="Ciclo actual (ej. 202517)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="PDFs a procesar en paralelo (default: 1)")
     args = parser.parse_args()
-    main(args.cycle)
+    main(args.cycle, args.workers)
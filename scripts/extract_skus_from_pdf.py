@@ -12,19 +12,27 @@ Función:
 
 Requisitos:
     pip install pymupdf
-    pip install pytesseract pillow      (solo si quieres OCR)
+    pip install pytesseract pillow numpy (solo si quieres OCR)
+    pip install tesserocr                (opcional: workers de OCR persistentes)
 """
 
 import re
+import sys
 from pathlib import Path
 from typing import List, Set
+from concurrent.futures import wait, FIRST_COMPLETED
 
 import fitz  # PyMuPDF
 
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT))
+
+from pipeline.extract.page_cache import PageCache, file_sha256
+
 # Opcional para OCR (solo si lo necesitas)
 try:
-    import pytesseract
-    from PIL import Image
+    import numpy as np
+    from pipeline.extract.tesseract_pool import TesseractPool
     OCR_AVAILABLE = True
 except:
     OCR_AVAILABLE = False
@@ -52,28 +60,99 @@ def is_text_pdf(pdf_path: Path) -> bool:
     return False
 
 
-def extract_text_from_pdf(pdf_path: Path) -> str:
-    """Extrae texto con PyMuPDF o con OCR si es necesario."""
+# Subir si cambia la extracción por página (invalida el cache)
+EXTRACT_VERSION = 2
+
+# Páginas imagen por lote de OCR: sin tesserocr, una invocación de
+# tesseract por lote (TIFF multipágina) en lugar de una por página
+OCR_BATCH = 8
+
+_OCR_POOL = None
+
+
+def get_ocr_pool():
+    """Pool de tesseract compartido por todos los PDFs de la corrida."""
+    global _OCR_POOL
+    if _OCR_POOL is None:
+        _OCR_POOL = TesseractPool(lang="eng")
+    return _OCR_POOL
+
+
+def _extract_missing(pdf_path: Path, have: set) -> tuple[dict, int]:
+    """
+    Extrae las páginas que no están en el cache.
+    Las páginas con texto se leen directo; las páginas imagen se rasterizan
+    en gris y se mandan al pool en lotes de OCR_BATCH, con a lo más dos
+    lotes por worker en espera (memoria acotada).
+    Retorna: ({page_number: (text, used_method)}, page_count)
+    """
+    pages, batch, pending = {}, [], {}
+
+    def flush():
+        if batch:
+            future = get_ocr_pool().submit([img for _page, img in batch])
+            pending[future] = [page for page, _img in batch]
+            batch.clear()
+
+    def collect(done):
+        for future in done:
+            for page_number, text in zip(pending.pop(future), future.result()):
+                pages[page_number] = (text, "ocr")
+
     with fitz.open(pdf_path) as doc:
-        final_text = []
+        for i, page in enumerate(doc):
+            if i+1 in have:
+                continue
 
-        for page_num, page in enumerate(doc):
             text = page.get_text()
-
             if text and len(text.strip()) > 20:
-                final_text.append(text)
-            else:
-                if OCR_AVAILABLE:
-                    # usar OCR
-                    pix = page.get_pixmap(dpi=200)
-                    img_path = pdf_path.with_suffix(f".page{page_num}.png")
-                    pix.save(img_path)
-                    ocr_text = pytesseract.image_to_string(Image.open(img_path))
-                    final_text.append(ocr_text)
-                else:
-                    final_text.append("")
+                pages[i+1] = (text, "native")
+                continue
+            if not OCR_AVAILABLE:
+                pages[i+1] = ("", "none")
+                continue
+
+            # usar OCR: píxeles en gris directo a tesseract, sin PNG intermedio
+            pix = page.get_pixmap(dpi=200, colorspace=fitz.csGRAY, alpha=False)
+            img = np.frombuffer(pix.samples, dtype=np.uint8).reshape(pix.height, pix.width)
+            batch.append((i+1, img))
+            del pix
+
+            if len(batch) == OCR_BATCH:
+                flush()
+                while len(pending) > 2 * get_ocr_pool().workers:
+                    collect(wait(list(pending), return_when=FIRST_COMPLETED).done)
 
-    return "\n".join(final_text)
+        flush()
+        collect(wait(list(pending)).done)
+        return pages, len(doc)
+
+
+def extract_text_from_pdf(pdf_path: Path) -> str:
+    """
+    Extrae texto con PyMuPDF o con OCR si es necesario (con cache por página).
+    Solo se extraen las páginas que falten en el cache (_extract_missing).
+    """
+    # Sin OCR las páginas imagen quedan vacías: se cachean con otra llave
+    method = "auto:min20:ocr-dpi200:eng" if OCR_AVAILABLE else "native-only:min20"
+
+    cache = PageCache()
+    try:
+        pdf_hash = file_sha256(pdf_path)
+        pages = {
+            page: text
+            for page, (text, _used) in cache.get_pages(pdf_hash, method, EXTRACT_VERSION).items()
+        }
+        page_count = cache.get_page_count(pdf_hash, method, EXTRACT_VERSION)
+
+        if page_count is None or len(pages) < page_count:
+            new, page_count = _extract_missing(pdf_path, set(pages))
+            cache.put_pages(pdf_hash, method, EXTRACT_VERSION, new, page_count)
+            pages.update((page, text) for page, (text, _used) in new.items())
+    finally:
+        cache.close()
+
+    return "\n".join(pages[page] for page in sorted(pages))
 
 
 def extract_skus_from_text(text: str) -> List[str]:
@@ -153,3 +232,6 @@ if __name__ == "__main__":
             extract_skus_for_pdf(path, marca, ciclo)
         else:
             print(f"❌ No existe {path}")
+
+    if _OCR_POOL is not None:
+        _OCR_POOL.close()
@@ -9,28 +9,51 @@ Salida:
  - output/page_classification/<pdf_name>.json  # detalles por página
  - output/page_classification/summary.json     # conteo global por tipo
  - output/page_classification/summary.csv      # versión CSV
+ - output/page_classification/features.npz     # matriz de features por página
 
 Uso:
-    python scripts/page_classifier.py
+    python scripts/page_classifier.py [--workers N] [--strip-boilerplate]
 """
 
+import sys
 import re
 import json
 import csv
+import argparse
 from pathlib import Path
 from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from typing import Dict, Any, List
 
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT))
+
+from pipeline.clean.prepared_page import PreparedPage
+from pipeline.parse.page_rules import FeatureMatrix, TYPE_CODE, classify_row
+
 # Intentar usar el extractor ya creado; si no, fallback a PyMuPDF directo.
 try:
-    from pipeline.extract.extract_pipeline import extract_pdf
+    from pipeline.extract.extract_pipeline import iter_pdf_pages
+    from pipeline.extract.metrics import get_metrics
     HAS_PIPELINE_EXTRACT = True
 except Exception:
     HAS_PIPELINE_EXTRACT = False
     import fitz  # PyMuPDF
 
+# Boilerplate (--strip-boilerplate) es opcional: sin él se clasifica el texto completo
+try:
+    from pipeline.clean.boilerplate import BoilerplateIndex, strip_boilerplate, save_boilerplate
+    HAS_BOILERPLATE = True
+except Exception:
+    HAS_BOILERPLATE = False
+
+    def strip_boilerplate(text: str, boilerplate: frozenset) -> str:
+        return text
+
 OUTPUT_DIR = Path("output/page_classification")
 INPUT_DIR = Path("input_pdfs")
+FEATURES_FILE = OUTPUT_DIR / "features.npz"   # matriz de features de la corrida
 OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 
 # -------------------------
@@ -45,16 +68,105 @@ RE_PERCENT = re.compile(r"(\d{1,3})\s*%")
 RE_PROMO_TAG = re.compile(r"\b(OFERTA|PROMOCIÓN|PROMO|MEGA|SUPER PROMO|SUPER PROMOCION|MEGAOFERTA)\b", re.I)
 RE_COMBO = re.compile(r"\b(Combo|Set|Kit|Incluye|Paquete)\b", re.I)
 RE_LEGAL = re.compile(r"\b(COFEPRIS|PROMOCI[oó]n v[aá]lida|Promoci[oó]n v[aá]lida|Promoción válida|Promoción válida hasta|Aviso COFEPRIS|Promoción válida únicamente)\b", re.I)
-RE_TONE_LIST_LINE = re.compile(r".*\(\s*\d{3,7}\s*\)\s*$")      # lines that end with (12345)
+RE_TONE_LIST_LINE = re.compile(r"\([^\S\n]*\d{3,7}[^\S\n]*\)(?=\n|\Z)")  # (12345) al final de una línea
 RE_POINTS = re.compile(r"\b\d+\s+pts\b", re.I)
 RE_PRICE_LINE_ALONE = re.compile(r"^\s*\$?\s*\d{1,3}(?:[.,]\d{2})?\s*$")
 
 # -------------------------
 # Clasificador de página
 # -------------------------
-def classify_page(text: str) -> Dict[str, Any]:
+def page_lines(text: str | PreparedPage) -> List[str]:
+    if isinstance(text, PreparedPage):
+        return text.stripped
+    return [ln.strip() for ln in text.splitlines() if ln.strip()]
+
+# -------------------------
+# Escáner combinado: banderas de la página en una sola pasada
+# -------------------------
+# Los patrones de arriba, sin cambios, como grupos con nombre de un solo
+# patrón, más TONE (RE_TONE_LIST_LINE sobre las líneas unidas con "\n":
+# cuenta una por línea, sin cruzar saltos). El lookahead inicial descarta cada
+# posición donde ninguno puede empezar: dígito, "(" o la primera letra de
+# alguna palabra clave.
+FLAG_GROUPS = [
+    ("LEGAL", RE_LEGAL),      # antes que PROMO: en "Promoción válida" gana LEGAL
+    ("PROMO", RE_PROMO_TAG),
+    ("COMBO", RE_COMBO),
+    ("POINTS", RE_POINTS),
+    ("DE_A_1", RE_DE_A_1),
+    ("DE_A_2", RE_DE_A_2),
+]
+
+# Una coincidencia consume su texto y puede tapar a otra que empiece dentro
+# de ella ("SUPER PROMOCION VALIDA", "A: 19 pts"); en cualquier otra
+# posición el escáner ya probó todos los grupos. Si la tapada no apareció,
+# se prueba su patrón propio solo dentro de los tramos que la pueden cubrir.
+HIDDEN_BY = [
+    ("PROMO", RE_PROMO_TAG, {"LEGAL"}),
+    ("LEGAL", RE_LEGAL, {"PROMO"}),
+    ("POINTS", RE_POINTS, {"DE_A_1", "DE_A_2"}),
+]
+COVERS = {"LEGAL", "PROMO", "DE_A_1", "DE_A_2"}
+
+def _compile_flags() -> re.Pattern:
+    groups = "|".join(f"(?P<{name}>{rx.pattern})" for name, rx in FLAG_GROUPS)
+    tone = f"(?P<TONE>{RE_TONE_LIST_LINE.pattern})"
+    return re.compile(rf"(?=[\d(acdikmops])(?:{groups}|{tone})", re.I)
+
+RE_FLAGS = _compile_flags()
+
+def _flags(found: set, spans: list, tone_lines: int, text: str) -> Dict[str, Any]:
+    """spans: [(grupo, start, end)] de las coincidencias de grupos en COVERS."""
+    for name, rx, covers in HIDDEN_BY:
+        if name in found or not found & covers:
+            continue
+        match = rx.match  # match(text, p) mira el carácter previo para \b
+        if any(match(text, p) for group, start, end in spans if group in covers
+               for p in range(start, end)):
+            found.add(name)
+    return {
+        "has_points": "POINTS" in found,
+        "has_promo_tag": "PROMO" in found,
+        "has_combo": "COMBO" in found,
+        "has_legal": "LEGAL" in found,
+        "has_de_a": "DE_A_1" in found or "DE_A_2" in found,
+        "tone_lines": tone_lines,
+    }
+
+def page_features(lines: List[str]) -> Dict[str, Any]:
+    """
+    Features de una página:
+    - listas (SKUs, precios, %): findall por patrón; sus coincidencias se
+      traslapan entre sí y no pueden compartir una pasada
+    - banderas y líneas de tonos: una sola pasada de RE_FLAGS
+    - skus_inline queda en None: normalize_skus lo calcula solo si
+      la página no tiene SKUs entre paréntesis
+    """
+    joined = "\n".join(lines)
+    found, spans = set(), []
+    tone_lines = 0
+    for m in RE_FLAGS.finditer(joined):
+        group = m.lastgroup
+        if group == "TONE":
+            tone_lines += 1
+            continue
+        found.add(group)
+        if group in COVERS:
+            spans.append((group, m.start(), m.end()))
+
+    return {
+        "text": joined,
+        "skus": RE_SKU_PARENS.findall(joined),
+        "skus_inline": None,
+        "prices": RE_PRICE.findall(joined),
+        "percents": RE_PERCENT.findall(joined),
+        **_flags(found, spans, tone_lines, joined),
+    }
+
+def classify_page(text: str | PreparedPage) -> Dict[str, Any]:
     """
     Clasifica una página y extrae metadatos útiles.
+    Acepta texto crudo o una PreparedPage (reusa sus líneas ya limpias).
     Devuelve dict con:
       - detected_type
       - skus_found (list)
@@ -63,67 +175,73 @@ def classify_page(text: str) -> Dict[str, Any]:
       - points_found (bool)
       - summary (short)
     """
-    lines = [ln.strip() for ln in text.splitlines() if ln.strip()]
-    joined = "\n".join(lines)
+    lines = page_lines(text)
+    return classify_features(lines, page_features(lines))
 
-    skus = RE_SKU_PARENS.findall(joined)
-    skus_inline = RE_SKU_INLINE.findall(joined)
+def classify_page_row(text: str | PreparedPage) -> tuple:
+    """
+    Como classify_page, y además la fila de features de la página (en el
+    orden de page_rules.FEATURES) para la matriz de la corrida.
+    Retorna: (info, fila)
+    """
+    lines = page_lines(text)
+    features = page_features(lines)
+    skus_norm = normalize_skus(features)
+    row = feature_row(lines, features, skus_norm)
+    return page_result(lines, features, skus_norm, classify_row(row)), row
+
+def normalize_skus(features: Dict[str, Any]) -> List[str]:
+    """SKUs únicos de la página, en orden de aparición."""
+    skus = features["skus"]
     # filtro mínimo: si paréntesis detectados, prefierelos; si no, tomar numericos que aparezcan con contexto
     skus_norm = list(dict.fromkeys([s.strip("() ").strip() for s in skus]))  # uniq order-preserving
     if not skus_norm:
+        # Los números sueltos solo se buscan aquí, cuando hacen falta
+        skus_inline = features["skus_inline"]
+        if skus_inline is None:
+            skus_inline = RE_SKU_INLINE.findall(features["text"])
         # filtrar números que parecen SKU (pero evitar años, largos, etc)
         maybe = []
         for token in skus_inline:
             if len(token) >= 3 and len(token) <= 7:
                 maybe.append(token)
         skus_norm = list(dict.fromkeys(maybe))
+    return skus_norm
+
+def feature_row(lines: List[str], features: Dict[str, Any], skus_norm: List[str]) -> tuple:
+    """Fila de la página en el orden de page_rules.FEATURES."""
+    return (
+        len(lines),
+        len(skus_norm),
+        len(features["prices"]),
+        len(features["percents"]),
+        features["has_points"],
+        features["has_promo_tag"],
+        features["has_combo"],
+        features["has_legal"],
+        features["has_de_a"],
+        features["tone_lines"],
+    )
+
+def classify_features(lines: List[str], features: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Reglas de clasificación sobre las features ya calculadas de una página.
+    Las reglas y umbrales están en pipeline/parse/page_rules.py (RULES):
+    EMPTY, LEGAL, PROMO_BANNER, COMBO, TONES_LIST, DE_TO_A,
+    PRODUCT_SIMPLE, SKU_ONLY, PROMO_BANNER (promo + %), UNKNOWN.
+    """
+    skus_norm = normalize_skus(features)
+    dtype = classify_row(feature_row(lines, features, skus_norm))
+    return page_result(lines, features, skus_norm, dtype)
 
-    prices = RE_PRICE.findall(joined)
-    percents = RE_PERCENT.findall(joined)
-    has_points = bool(RE_POINTS.search(joined))
-    has_promo_tag = bool(RE_PROMO_TAG.search(joined))
-    has_combo = bool(RE_COMBO.search(joined))
-    has_legal = bool(RE_LEGAL.search(joined))
-
-    # heurísticas para detectar tipos
-    # 1) EMPTY
-    if len(lines) == 0:
-        dtype = "EMPTY"
-
-    # 2) LEGAL / BANNER (texto sin skus ni precios y contiene legal keywords)
-    elif has_legal and not skus_norm and not prices:
-        dtype = "LEGAL"
-
-    # 3) PAGE PROMO / BANNER (promo words but no sku)
-    elif has_promo_tag and not skus_norm:
-        dtype = "PROMO_BANNER"
-
-    # 4) COMBO (presence of 'Combo' or multiple '-' or 'Incluye')
-    elif has_combo:
-        dtype = "COMBO"
-
-    # 5) MANY_TONES / SKU LIST (lines with many "(nnn)" occurrences or many sku-like tokens)
-    else:
-        # contar cuántas líneas terminan en (12345)
-        tone_lines = sum(1 for ln in lines if RE_TONE_LIST_LINE.match(ln))
-        sku_count = len(skus_norm)
-        # If many sku-like lines or many sku tokens in page -> TONES_LIST
-        if tone_lines >= 3 or sku_count >= 6:
-            dtype = "TONES_LIST"
-        # If there is "De" and "A" or pattern like "De: ... A: ..." => DE_TO_A
-        elif RE_DE_A_1.search(joined) or RE_DE_A_2.search(joined):
-            dtype = "DE_TO_A"
-        # If there's at least one sku and at least one price on same page -> PRODUCT_SIMPLE
-        elif sku_count >= 1 and prices:
-            dtype = "PRODUCT_SIMPLE"
-        # If there's just SKUs but no prices (catalogo de tonos sin precio)
-        elif sku_count >= 1 and not prices:
-            dtype = "SKU_ONLY"
-        # fallback: if promo tag + percent
-        elif has_promo_tag and percents:
-            dtype = "PROMO_BANNER"
-        else:
-            dtype = "UNKNOWN"
+def page_result(lines: List[str], features: Dict[str, Any], skus_norm: List[str],
+                dtype: str) -> Dict[str, Any]:
+    """Salida por página (la que se guarda en <pdf>_classification.json)."""
+    prices = features["prices"]
+    percents = features["percents"]
+    has_points = features["has_points"]
+    has_combo = features["has_combo"]
+    has_legal = features["has_legal"]
 
     summary = []
     if skus_norm:
@@ -153,39 +271,94 @@ def classify_page(text: str) -> Dict[str, Any]:
 # -------------------------
 # Utils: extracción fallback con PyMuPDF
 # -------------------------
-def extract_pages_with_pymupdf(pdf_path: Path) -> Dict[int, str]:
+def iter_pages_with_pymupdf(pdf_path: Path, skip: set = frozenset()):
+    import fitz  # PyMuPDF (también como respaldo si el pipeline falla a la mitad)
+
     doc = fitz.open(str(pdf_path))
-    pages = {}
-    for i, page in enumerate(doc):
-        text = page.get_text("text")
-        pages[i+1] = text or ""
-    doc.close()
-    return pages
+    try:
+        for i, page in enumerate(doc):
+            if i+1 in skip:
+                continue
+            yield i+1, page.get_text("text") or ""
+    finally:
+        doc.close()
+
+def extract_pages_with_pymupdf(pdf_path: Path) -> Dict[int, str]:
+    return dict(iter_pages_with_pymupdf(pdf_path))
+
+def iter_pages(pdf_path: Path):
+    """
+    Produce (page_num, text) página por página.
+    Si el pipeline falla a la mitad, continúa con PyMuPDF desde donde se quedó.
+    """
+    if not HAS_PIPELINE_EXTRACT:
+        yield from iter_pages_with_pymupdf(pdf_path)
+        return
+
+    done = set()
+    try:
+        for page_num, text, _meta in iter_pdf_pages(str(pdf_path)):
+            done.add(page_num)
+            yield page_num, text
+    except Exception as e:
+        print(f"Warning: pipeline.extract failed for {pdf_path.name}: {e}. Falling back to PyMuPDF.")
+        yield from iter_pages_with_pymupdf(pdf_path, skip=done)
 
 # -------------------------
 # Runner principal
 # -------------------------
-def process_pdf(pdf_path: Path) -> Dict[str, Any]:
-    print(f"Processing {pdf_path.name} ...")
+def index_pdf(pdf_path: Path) -> Dict[str, Any]:
+    """Conteo de líneas repetidas de un PDF (una tarea de la pre-pasada)."""
+    index = BoilerplateIndex()
+    for _page_num, text in iter_pages(pdf_path):
+        index.add_page(text)
+
+    result = {"index": index}
     if HAS_PIPELINE_EXTRACT:
-        try:
-            pages = extract_pdf(str(pdf_path))
-        except Exception as e:
-            print(f"Warning: pipeline.extract failed for {pdf_path.name}: {e}. Falling back to PyMuPDF.")
-            pages = extract_pages_with_pymupdf(pdf_path)
-    else:
-        pages = extract_pages_with_pymupdf(pdf_path)
+        result["metrics"] = get_metrics().drain()
+    return result
 
+def build_boilerplate(pdfs: List[Path], workers: int = 1) -> tuple:
+    """
+    Pre-pasada sobre todos los PDFs: líneas repetidas en buena parte del
+    corpus (pies legales, slogans). Cada PDF se cuenta en el mismo pool que
+    la clasificación (map_pdfs) y los conteos se suman. Con el cache de
+    páginas la segunda lectura de cada PDF ya no vuelve a extraer.
+    Retorna: (boilerplate, métricas de extracción de la pre-pasada). Las
+    métricas no se agregan al colector aquí: los workers de la clasificación
+    lo heredarían y las reportarían de nuevo.
+    """
+    index = BoilerplateIndex()
+    metrics = []
+    for res in map_pdfs(index_pdf, pdfs, workers):
+        metrics.extend(res.get("metrics", ()))
+        index.merge(res["index"])
+    return index.build(), metrics
+
+def process_pdf(pdf_path: Path, boilerplate: frozenset = frozenset()) -> Dict[str, Any]:
+    print(f"Processing {pdf_path.name} ...")
+
+    # Clasificación incremental: cada página se clasifica en cuanto se extrae
     per_page = {}
     counts = Counter()
-    for page_num, text in pages.items():
-        info = classify_page(text)
+    rows = []
+    for page_num, text in iter_pages(pdf_path):
+        info, row = classify_page_row(strip_boilerplate(text, boilerplate))
         per_page[page_num] = info
         counts[info["detected_type"]] += 1
+        rows.append(row)
+
+    # Features por página: main las junta en una matriz de toda la corrida
+    features = FeatureMatrix(
+        rows,
+        [pdf_path.name] * len(rows),
+        list(per_page),
+        [TYPE_CODE[info["detected_type"]] for info in per_page.values()],
+    )
 
     result = {
         "pdf": pdf_path.name,
-        "total_pages": len(pages),
+        "total_pages": len(per_page),
         "counts": dict(counts),
         "pages": per_page
     }
@@ -196,23 +369,57 @@ def process_pdf(pdf_path: Path) -> Dict[str, Any]:
         json.dump(result, f, indent=2, ensure_ascii=False)
     print(f" - Saved {out_file}")
 
+    result["features"] = features
+
+    # Métricas de extracción de este PDF (viajan con el resultado si corre en un worker)
+    if HAS_PIPELINE_EXTRACT:
+        result["metrics"] = get_metrics().drain()
+
     return result
 
 # -------------------------
 # Main
 # -------------------------
-def main():
+def map_pdfs(worker, pdfs: List[Path], workers: int = 1) -> list:
+    """
+    worker(pdf) para cada PDF, en serie o en un pool de procesos (uno por
+    catálogo). Los resultados siempre regresan en el orden de `pdfs`.
+    """
+    if workers <= 1 or len(pdfs) <= 1:
+        return [worker(pdf) for pdf in pdfs]
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(pdfs))) as pool:
+        return list(pool.map(worker, pdfs))
+
+def process_pdfs(pdfs: List[Path], workers: int = 1,
+                 boilerplate: frozenset = frozenset()) -> List[Dict[str, Any]]:
+    """Clasifica los PDFs (ver map_pdfs)."""
+    return map_pdfs(partial(process_pdf, boilerplate=boilerplate), pdfs, workers)
+
+def main(workers: int = 1, strip: bool = False):
     pdfs = sorted([p for p in INPUT_DIR.glob("*.pdf")])
     if not pdfs:
         print("No PDFs found in input_pdfs/. Coloca los catálogos allí y vuelve a ejecutar.")
         return
 
+    boilerplate = frozenset()
+    prepass_metrics = []
+    if strip and not HAS_BOILERPLATE:
+        print("Warning: pipeline.clean no disponible; se clasifica sin quitar boilerplate.")
+    elif strip:
+        boilerplate, prepass_metrics = build_boilerplate(pdfs, workers)
+        save_boilerplate(boilerplate)
+        print(f"Boilerplate: {len(boilerplate)} líneas repetidas se quitarán antes de clasificar")
+
     all_results = []
     global_counter = Counter()
     summary_rows = []
+    matrices = []
 
-    for pdf in pdfs:
-        res = process_pdf(pdf)
+    for res in process_pdfs(pdfs, workers, boilerplate):
+        if HAS_PIPELINE_EXTRACT:
+            get_metrics().extend(res.pop("metrics"))
+        matrices.append(res.pop("features"))
         all_results.append(res)
         for k, v in res["counts"].items():
             global_counter[k] += v
@@ -222,6 +429,8 @@ def main():
         for t, c in res["counts"].items():
             row[t] = c
         summary_rows.append(row)
+    if HAS_PIPELINE_EXTRACT:
+        get_metrics().extend(prepass_metrics)
 
     # Save consolidated JSON
     consolidated = {
@@ -248,10 +457,25 @@ def main():
             writer.writerow(r)
     print(f"Saved CSV: {csv_file}")
 
+    # Matriz de features (una fila por página de todos los PDFs): permite
+    # re-clasificar con otros umbrales sin re-extraer (reclassify_pages.py)
+    features_file = FeatureMatrix.stack(matrices).save(FEATURES_FILE)
+    print(f"Saved feature matrix: {features_file}")
+
+    if HAS_PIPELINE_EXTRACT:
+        jsonl_path, prom_path = get_metrics().export(name="classifier_extract")
+        print(f"Saved metrics: {jsonl_path}, {prom_path}")
+
     # print quick report
     print("\n=== GLOBAL REPORT ===")
     for k, v in global_counter.most_common():
         print(f"{k:20s} : {v}")
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, default=1,
+                        help="PDFs a procesar en paralelo (default: 1)")
+    parser.add_argument("--strip-boilerplate", action="store_true",
+                        help="Quitar pies legales/slogans repetidos antes de clasificar")
+    args = parser.parse_args()
+    main(args.workers, args.strip_boilerplate)
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+scripts/reclassify_pages.py
+
+Re-clasifica todas las páginas de la última corrida de page_classifier.py
+con otros umbrales, sin re-extraer texto: las reglas de
+pipeline/parse/page_rules.py corren como máscaras sobre la matriz de
+features guardada (output/page_classification/features.npz).
+
+Muestra el conteo por tipo antes / después y qué páginas cambian.
+Con --write actualiza detected_type y counts en cada
+<pdf>_classification.json (lo que leen los parsers) y los tipos de la
+matriz; summary.json / summary.csv quedan de la corrida original.
+
+Uso:
+    python scripts/reclassify_pages.py --set tone_lines_min=4 --set sku_count_min=8
+    python scripts/reclassify_pages.py --set tone_lines_min=4 --write
+"""
+
+import sys
+import json
+import time
+import argparse
+from pathlib import Path
+from collections import Counter
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT))
+
+from pipeline.parse.page_rules import THRESHOLDS, FeatureMatrix, type_names
+
+OUTPUT_DIR = Path("output/page_classification")
+FEATURES_FILE = OUTPUT_DIR / "features.npz"
+
+
+def parse_thresholds(items: list) -> dict:
+    thresholds = {}
+    for item in items:
+        name, sep, value = item.partition("=")
+        if not sep or name not in THRESHOLDS:
+            raise SystemExit(f"❌ Umbral inválido: {item!r} (disponibles: {', '.join(THRESHOLDS)})")
+        thresholds[name] = int(value)
+    return thresholds
+
+
+def write_classifications(matrix: FeatureMatrix, new_types: np.ndarray, changed: np.ndarray):
+    """Actualiza los <pdf>_classification.json que tienen páginas con otro tipo."""
+    names = type_names(new_types)
+    for pdf in np.unique(matrix.pdfs[changed]):
+        file = OUTPUT_DIR / f"{Path(pdf).stem}_classification.json"
+        if not file.exists():
+            print(f"⚠️  No existe {file}, se omite")
+            continue
+        data = json.loads(file.read_text(encoding="utf-8"))
+        for i in np.flatnonzero(matrix.pdfs == pdf):
+            info = data["pages"].get(str(matrix.pages[i]))
+            if info is not None:
+                info["detected_type"] = names[i]
+        data["counts"] = dict(Counter(info["detected_type"] for info in data["pages"].values()))
+        with open(file, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+        print(f"💾 {file}")
+
+
+def main(features_file: Path, thresholds: dict, show: int = 20, write: bool = False):
+    if not features_file.exists():
+        print(f"❌ No existe {features_file}: corre primero scripts/page_classifier.py")
+        return
+
+    matrix = FeatureMatrix.load(features_file)
+    print(f"📄 {len(matrix)} páginas de {len(np.unique(matrix.pdfs))} PDFs")
+    current = {**THRESHOLDS, **thresholds}
+    print(f"⚙️  Umbrales: {', '.join(f'{k}={v}' for k, v in current.items())}")
+
+    t0 = time.perf_counter()
+    new_types = matrix.classify(thresholds)
+    elapsed = time.perf_counter() - t0
+    print(f"⏱  Reglas sobre la matriz: {elapsed * 1000:.2f} ms")
+
+    before = Counter(type_names(matrix.types))
+    after = Counter(type_names(new_types))
+    print("\n📊 Tipo                  antes  después")
+    for dtype in sorted(set(before) | set(after)):
+        print(f"   {dtype:<20} {before[dtype]:>6} {after[dtype]:>8}")
+
+    changed = matrix.types != new_types
+    print(f"\n🔁 Páginas que cambian de tipo: {int(changed.sum())}")
+    if not changed.any():
+        return
+
+    old_names, new_names = type_names(matrix.types), type_names(new_types)
+    moves = Counter((old_names[i], new_names[i]) for i in np.flatnonzero(changed))
+    for (old, new), count in moves.most_common():
+        print(f"   • {old:<16} → {new:<16} {count:>6}")
+    for i in np.flatnonzero(changed)[:show]:
+        print(f"     {matrix.pdfs[i]} p.{matrix.pages[i]}: {old_names[i]} → {new_names[i]}")
+
+    if write:
+        write_classifications(matrix, new_types, changed)
+        FeatureMatrix(matrix.values, matrix.pdfs, matrix.pages, new_types).save(features_file)
+        print(f"💾 {features_file}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--features", type=Path, default=FEATURES_FILE,
+                        help="Matriz guardada por page_classifier.py")
+    parser.add_argument("--set", action="append", default=[], metavar="UMBRAL=VALOR",
+                        help=f"Cambiar un umbral ({', '.join(THRESHOLDS)}); repetible")
+    parser.add_argument("--show", type=int, default=20,
+                        help="Páginas cambiadas a listar (default: 20)")
+    parser.add_argument("--write", action="store_true",
+                        help="Guardar los tipos nuevos en los *_classification.json")
+    args = parser.parse_args()
+    main(args.features, parse_thresholds(args.set), args.show, args.write)
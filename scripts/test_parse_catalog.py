@@ -7,10 +7,16 @@ sys.path.append(str(ROOT))
 
 
 import json
+import argparse
 from pathlib import Path
 
-from pipeline.extract.extract_pipeline import extract_pdf
+from pipeline.clean.boilerplate import load_boilerplate, strip_boilerplate
+from pipeline.extract.extract_pipeline import iter_pdf_pages
+from pipeline.extract.metrics import get_metrics
 from pipeline.parse.page_router import PageRouter
+from pipeline.parse.parse_cache import ParseCache
+from pipeline.parse.product_table import ProductTable
+from pipeline.parse.product_merge import ProductMerger
 
 CLASSIFICATION_DIR = Path("output/page_classification")
 INPUT_DIR = Path("input_pdfs")
@@ -24,58 +30,82 @@ def load_classification(pdf_name):
         raise FileNotFoundError(f"No existe clasificación: {file}")
     return json.loads(file.read_text(encoding="utf-8"))
 
-def test_parse(pdf_path: Path):
+def test_parse(pdf_path: Path, boilerplate: frozenset = frozenset(), sweep: bool = False,
+               workers: int = 1, cache: ParseCache | None = None,
+               merge: bool = True) -> ProductTable:
     print(f"\n=== Procesando catálogo: {pdf_path.name} ===\n")
 
     # Cargar clasificación de páginas
     classification = load_classification(pdf_path.stem)
 
-    # Extraer texto original
-    pages_text = extract_pdf(str(pdf_path))
+    router = PageRouter(product_simple_mode="sweep" if sweep else "window", cache=cache)
 
-    router = PageRouter()
-    productos = []
+    # Páginas extraídas (del cache si ya se extrajeron) → un solo parse por documento
+    pages = (
+        (page_number, strip_boilerplate(text, boilerplate))
+        for page_number, text, _extract_meta in iter_pdf_pages(str(pdf_path))
+    )
+    productos = router.parse_document(pages, classification, pdf_path.name, workers=workers,
+                                      table=ProductTable())
+    extraidos = len(productos)
 
-    total_pages = classification["total_pages"]
-    for page_number in range(1, total_pages+1):
+    # Un producto por SKU: el mismo código en varias páginas se consolida
+    if merge:
+        merger = ProductMerger()
+        merger.extend(productos.rows())
+        productos = merger.to_table()
 
-        meta = classification["pages"].get(str(page_number))
-        if not meta:
-            continue
-
-        detected_type = meta["detected_type"]
-
-        # Evitar procesar páginas sin contenido útil
-        if detected_type in ("UNKNOWN", "PROMO_BANNER"):
-            continue
-
-        text = pages_text.get(page_number, "")
-        page_meta = {
-            "page": page_number,
-            "detected_type": detected_type
-        }
-
-        salida = router.parse_page(text, page_meta, pdf_path.name)
-
-        if salida:
-            productos.extend(salida)
-
-    # Exportar productos encontrados
-    out_path = OUTPUT_DIR / f"{pdf_path.stem}_parsed.json"
-    with open(out_path, "w", encoding="utf-8") as f:
-        json.dump(productos, f, indent=2, ensure_ascii=False)
+    # Exportar productos encontrados (fila por fila desde la tabla)
+    out_path = productos.write_json(OUTPUT_DIR / f"{pdf_path.stem}_parsed.json")
 
     print(f"\n✔ Archivo generado: {out_path}\n")
-    print(f"✔ Total de productos extraídos: {len(productos)}\n")
+    print(f"✔ Total de productos extraídos: {extraidos}"
+          + (f" → {len(productos)} tras consolidar por SKU" if merge else "") + "\n")
+    return productos
 
-def main():
+def main(strip: bool = False, sweep: bool = False, workers: int = 1, use_cache: bool = True,
+         merge: bool = True):
     pdfs = sorted(INPUT_DIR.glob("*.pdf"))
     if not pdfs:
         print("No hay PDFs en input_pdfs/")
         return
 
-    for pdf in pdfs:
-        test_parse(pdf)
+    # Conjunto generado por page_classifier.py --strip-boilerplate
+    boilerplate = load_boilerplate() if strip else frozenset()
+
+    # Resultados por (texto de página, tipo, parser, versión): al cambiar un
+    # parser solo se re-parsean sus páginas
+    cache = ParseCache() if use_cache else None
+    catalog = ProductMerger()
+    try:
+        for pdf in pdfs:
+            productos = test_parse(pdf, boilerplate, sweep, workers, cache, merge)
+            if merge:
+                catalog.extend(productos.rows(), pdf=pdf.name)
+    finally:
+        if cache is not None:
+            print(f"✔ Cache de parseo: {cache.hits} páginas del cache, {cache.misses} parseadas")
+            cache.close()
+
+    # Consolidado entre catálogos (sources: "archivo.pdf#página")
+    if merge:
+        merged_path = catalog.to_table().write_json(OUTPUT_DIR / "catalog_merged.json")
+        print(f"✔ Consolidado de {len(pdfs)} PDFs: {len(catalog)} productos → {merged_path}")
+
+    jsonl_path, prom_path = get_metrics().export(name="parse_extract")
+    print(f"✔ Métricas de extracción: {jsonl_path}, {prom_path}")
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--strip-boilerplate", action="store_true",
+                        help="Quitar las líneas de output/boilerplate.json antes de parsear")
+    parser.add_argument("--sweep", action="store_true",
+                        help="PRODUCT_SIMPLE en modo barrido lineal (páginas con muchos SKUs)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Procesos para parsear cada catálogo (default: 1)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Parsear todas las páginas sin usar output/cache/parse_results.sqlite")
+    parser.add_argument("--no-merge", action="store_true",
+                        help="Escribir un registro por aparición, sin consolidar por SKU")
+    args = parser.parse_args()
+    main(args.strip_boilerplate, args.sweep, args.workers, not args.no_cache, not args.no_merge)